@@ -0,0 +1,271 @@
+r"""
+Clifford algebra of an orthogonal basis, with basis blades encoded as bitmasks
+"""
+
+__all__ = ["BladeAlgebra"]
+
+import numpy as _np
+
+
+def _popcount(mask):
+    return bin(mask).count("1")
+
+
+def _is_zero(value):
+    try:
+        return bool(value == 0)
+    except (TypeError, ValueError):
+        return False
+
+
+class BladeAlgebra:
+    r"""
+    Clifford algebra of an orthogonal basis :math:`\mathbf{e}_0,\ldots,\mathbf{e}_{n-1}`,
+    :math:`\langle \mathbf{e}_i, \mathbf{e}_j \rangle = 0` for :math:`i\neq j`.
+
+    The basis blade :math:`\mathbf{e}_{i_1}\cdots\mathbf{e}_{i_k}` (:math:`i_1 < \ldots < i_k`) is encoded as the bitmask
+    :math:`A = 2^{i_1} + \ldots + 2^{i_k}` and the geometric product of basis blades is
+
+    .. math::
+        \mathbf{e}_A \mathbf{e}_B = (-1)^{\#\{(i,j)\colon i\in A, j\in B, i>j\}} \prod_{i\in A\cap B} Q(\mathbf{e}_i) \; \mathbf{e}_{A \veebar B}
+
+    NOTE: for dimensions up to ``eager_table_dimension`` the signs and metric factors of all pairs of blades are
+    precomputed as a table. Products of real (floating point) multivectors with at least ``dense_product_size``
+    pairs of blades are then computed with array operations on that table instead of pair by pair.
+    """
+
+    eager_table_dimension = 8
+    dense_product_size = 64
+
+    def __init__(self, basis, metric):
+        r"""
+        :param basis: basis vectors, in the order used for the canonical keys of the blades
+        :param metric: :math:`Q(\mathbf{e}_i)=\langle \mathbf{e}_i, \mathbf{e}_i \rangle` for each basis vector
+        """
+        self.basis = tuple(basis)
+        self.metric = tuple(metric)
+        self.dimension = len(self.basis)
+        self.masks = {slot: 1 << index for index, slot in enumerate(self.basis)}
+        self._metric_factors = dict()
+        self._keys = dict()
+        self._encodings = dict()
+        self._table = None
+        self._dense_table = None
+        if self.dimension <= type(self).eager_table_dimension:
+            self._table = self.cayley_table()
+
+    def __repr__(self):
+        return "{0}({1}, {2})".format(type(self).__name__, self.basis, self.metric)
+
+    # region blades
+
+    @staticmethod
+    def reordering_sign(lhs, rhs):
+        r"""
+        :return: sign of the permutation that sorts the basis vectors of :math:`\mathbf{e}_A \mathbf{e}_B`
+        """
+        lhs = lhs >> 1
+        swaps = 0
+        while lhs:
+            swaps += _popcount(lhs & rhs)
+            lhs = lhs >> 1
+        return -1 if swaps & 1 else 1
+
+    def metric_factor(self, mask):
+        r""":return: :math:`\prod_{i\in A} Q(\mathbf{e}_i)`"""
+        if mask not in self._metric_factors:
+            factor = 1
+            for index in range(0, self.dimension):
+                if mask & (1 << index):
+                    factor = factor * self.metric[index]
+            self._metric_factors[mask] = factor
+        return self._metric_factors[mask]
+
+    def blade_product(self, lhs, rhs):
+        r"""
+        :return: (mask, factor) such that :math:`\mathbf{e}_A \mathbf{e}_B = factor\cdot\mathbf{e}_{mask}`
+        """
+        if self._table is not None:
+            return lhs ^ rhs, self._table[lhs][rhs]
+        return lhs ^ rhs, BladeAlgebra.reordering_sign(lhs, rhs) * self.metric_factor(lhs & rhs)
+
+    def cayley_table(self):
+        r"""
+        :return: factors :math:`f_{AB}` of :math:`\mathbf{e}_A \mathbf{e}_B = f_{AB}\,\mathbf{e}_{A\veebar B}` as nested lists
+        """
+        masks = _np.arange(0, 1 << self.dimension)
+        lhs, rhs = _np.meshgrid(masks, masks, indexing="ij")
+        swaps = _np.zeros(lhs.shape, dtype=_np.int64)
+        for shift in range(1, self.dimension):
+            common = (lhs >> shift) & rhs
+            for index in range(0, self.dimension):
+                swaps += (common >> index) & 1
+        signs = _np.where(swaps % 2 == 0, 1, -1).tolist()
+        return [
+            [sign * self.metric_factor(lhs_mask & rhs_mask) for rhs_mask, sign in enumerate(row)]
+            for lhs_mask, row in enumerate(signs)
+        ]
+
+    def dense_cayley_table(self):
+        r"""
+        :return: :py:meth:`cayley_table` as a (cached) :math:`2^n\times 2^n` array
+        """
+        if self._dense_table is None:
+            self._dense_table = _np.array(self._table if self._table is not None else self.cayley_table())
+        return self._dense_table
+
+    def encode(self, key):
+        r"""
+        :param key: product of basis vectors (in any order, possibly repeated)
+        :return: (mask, factor) such that the product equals :math:`factor\cdot\mathbf{e}_{mask}`
+        """
+        if key not in self._encodings:
+            mask = 0
+            factor = 1
+            for slot in key:
+                mask, slot_factor = self.blade_product(mask, self.masks[slot])
+                factor = factor * slot_factor
+            self._encodings[key] = mask, factor
+        return self._encodings[key]
+
+    def decode(self, mask):
+        """
+        :return: canonical key of the blade
+        """
+        if mask not in self._keys:
+            self._keys[mask] = tuple(slot for index, slot in enumerate(self.basis) if mask & (1 << index))
+        return self._keys[mask]
+
+    # endregion
+
+    # region multivectors
+
+    def encoded(self, terms):
+        """
+        :param terms: iterable of (key, coefficient)
+        :return: multivector as dict from blade mask to coefficient
+        """
+        multivector = dict()
+        for key, value in terms:
+            mask, factor = self.encode(key)
+            if _is_zero(factor):
+                continue
+            value = value if factor == 1 else factor * value
+            multivector[mask] = multivector[mask] + value if mask in multivector else value
+        return multivector
+
+    def decoded(self, multivector):
+        """
+        :return: dict from canonical key to (nonzero) coefficient
+        """
+        return {self.decode(mask): value for mask, value in multivector.items() if not _is_zero(value)}
+
+    def product(self, lhs, rhs, condition=None):
+        """
+        Geometric product
+
+        :param lhs: dict from blade mask to coefficient
+        :param rhs: dict from blade mask to coefficient
+        :param condition: if given, only pairs of blades (lhs mask, rhs mask) satisfying it are multiplied
+        :return: dict from blade mask to coefficient
+        """
+        if condition is None and len(lhs) * len(rhs) >= type(self).dense_product_size and self._table is not None:
+            result = self._dense_product(lhs, rhs)
+            if result is not None:
+                return result
+        result = dict()
+        for lhs_mask, lhs_value in lhs.items():
+            for rhs_mask, rhs_value in rhs.items():
+                if condition is not None and not condition(lhs_mask, rhs_mask):
+                    continue
+                mask, factor = self.blade_product(lhs_mask, rhs_mask)
+                if _is_zero(factor):
+                    continue
+                value = lhs_value * rhs_value
+                value = value if factor == 1 else factor * value
+                result[mask] = result[mask] + value if mask in result else value
+        return result
+
+    def _dense_product(self, lhs, rhs):
+        """
+        Geometric product of real multivectors through :py:meth:`dense_cayley_table`
+
+        :return: dict from blade mask to (nonzero) coefficient, or None if the coefficients are not real numbers
+        """
+        lhs_values, rhs_values = _np.asarray(list(lhs.values())), _np.asarray(list(rhs.values()))
+        table = self.dense_cayley_table()
+        if _np.result_type(lhs_values, rhs_values, table).kind != "f":
+            return None
+        lhs_masks, rhs_masks = _np.fromiter(lhs, dtype=_np.int64), _np.fromiter(rhs, dtype=_np.int64)
+        terms = _np.outer(lhs_values, rhs_values) * table[lhs_masks[:, None], rhs_masks[None, :]]
+        masks = lhs_masks[:, None] ^ rhs_masks[None, :]
+        dense = _np.bincount(masks.ravel(), weights=terms.ravel(), minlength=1 << self.dimension)
+        return {mask: value for mask, value in enumerate(dense.tolist()) if value != 0}
+
+    def outer_product(self, lhs, rhs):
+        r""":math:`\mathbf{e}_A\wedge\mathbf{e}_B` is :math:`\mathbf{e}_A\mathbf{e}_B` if :math:`A\cap B=\emptyset`, otherwise 0"""
+        return self.product(lhs, rhs, lambda lhs_mask, rhs_mask: not lhs_mask & rhs_mask)
+
+    def left_contraction(self, lhs, rhs):
+        r""":math:`\mathbf{e}_A\rfloor\mathbf{e}_B` is :math:`\mathbf{e}_A\mathbf{e}_B` if :math:`A\subseteq B`, otherwise 0"""
+        return self.product(lhs, rhs, lambda lhs_mask, rhs_mask: lhs_mask & rhs_mask == lhs_mask)
+
+    def right_contraction(self, lhs, rhs):
+        r""":math:`\mathbf{e}_A\lfloor\mathbf{e}_B` is :math:`\mathbf{e}_A\mathbf{e}_B` if :math:`B\subseteq A`, otherwise 0"""
+        return self.product(lhs, rhs, lambda lhs_mask, rhs_mask: lhs_mask & rhs_mask == rhs_mask)
+
+    def scalar_product(self, lhs, rhs):
+        r""":math:`\mathbf{e}_A * \mathbf{e}_B` is :math:`\mathbf{e}_A\mathbf{e}_B` if :math:`A=B`, otherwise 0"""
+        return self.product(lhs, rhs, lambda lhs_mask, rhs_mask: lhs_mask == rhs_mask)
+
+    @staticmethod
+    def grade(mask):
+        return _popcount(mask)
+
+    def grade_projection(self, multivector, grade):
+        """
+        :return: the terms of the given grade
+        """
+        return {mask: value for mask, value in multivector.items() if _popcount(mask) == grade}
+
+    def graded(self, multivector):
+        """
+        :return: dict from grade to the terms of that grade
+        """
+        grades = dict()
+        for mask, value in multivector.items():
+            grades.setdefault(_popcount(mask), dict())[mask] = value
+        return grades
+
+    @staticmethod
+    def _signed(multivector, sign):
+        return {mask: value if sign(_popcount(mask)) == 1 else -value for mask, value in multivector.items()}
+
+    def reverse(self, multivector):
+        r""":math:`\widetilde{\mathbf{e}_A} = (-1)^{k(k-1)/2}\mathbf{e}_A` for grade :math:`k`"""
+        return BladeAlgebra._signed(multivector, lambda grade: -1 if (grade * (grade - 1) // 2) & 1 else 1)
+
+    def grade_involution(self, multivector):
+        r""":math:`\widehat{\mathbf{e}_A} = (-1)^k\mathbf{e}_A` for grade :math:`k`"""
+        return BladeAlgebra._signed(multivector, lambda grade: -1 if grade & 1 else 1)
+
+    def conjugate(self, multivector):
+        r""":math:`\overline{\mathbf{e}_A} = (-1)^{k(k+1)/2}\mathbf{e}_A` for grade :math:`k`"""
+        return BladeAlgebra._signed(multivector, lambda grade: -1 if (grade * (grade + 1) // 2) & 1 else 1)
+
+    def to_dense(self, multivector, dtype=float):
+        """
+        :return: array with the coefficient of blade :math:`A` at index :math:`A`
+        """
+        dense = _np.zeros(1 << self.dimension, dtype=dtype)
+        for mask, value in multivector.items():
+            dense[mask] = value
+        return dense
+
+    def from_dense(self, dense):
+        """
+        :return: dict from blade mask to (nonzero) coefficient
+        """
+        return {mask: value for mask, value in enumerate(dense.tolist()) if not _is_zero(value)}
+
+    # endregion
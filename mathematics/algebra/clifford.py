@@ -2,12 +2,20 @@ r"""
 Clifford algebra
 """
 
+import inspect
 import itertools
-from collections import namedtuple
+from collections import OrderedDict
+
+import numpy as _np
+import sympy as _sympy
 
 from mathematics.number_theory.combinatorics import permutation_to_adjacent_transpositions
+from .blade_algebra import BladeAlgebra
 from .tensor import Tensor
 
+# sympy.lambdify has the cse parameter since sympy 1.9
+_lambdify_cse = {"cse": True} if "cse" in inspect.signature(_sympy.lambdify).parameters else {}
+
 
 class Clifford(Tensor):
     r"""
@@ -22,21 +30,85 @@ class Clifford(Tensor):
 	"""
 
     symmetric_bilinear_form = lambda x, y: 0  # could this be improved with metaclasses ??
+    cayley_table_size = 2 ** 16
+    coefficient_simplifier = None
+    product_cache_size = 0
+
+    @classmethod
+    def algebra_fingerprint(cls):
+        """
+		Identity of the algebra, computed once per class from the code (and the closure, if hashable)
+		of ``symmetric_bilinear_form``.
+
+		:return: hashable fingerprint
+		"""
+        if "_algebra_fingerprint" not in cls.__dict__:
+            form = cls.symmetric_bilinear_form
+            code = getattr(form, "__code__", None)
+            if code is None:
+                fingerprint = (id(form),)
+            else:
+                try:
+                    closure = tuple(cell.cell_contents for cell in form.__closure__ or ())
+                    hash(closure)
+                except (TypeError, ValueError):
+                    closure = id(form)
+                fingerprint = (code.co_code, code.co_consts, code.co_names, closure)
+            cls._algebra_fingerprint = fingerprint
+        return cls._algebra_fingerprint
 
     def __eq__(self, other):
         """Overrides the default implementation, want to check that the quadratic form is equal as well"""
         if type(other) is type(self):
-            # TODO: check that this does not mix Clifford classes without different symmetric bilinear forms,
-            # as created with class factories.
-            return (
-                self.items() == other.items()
-                and self.symmetric_bilinear_form.__code__.co_code == other.symmetric_bilinear_form.__code__.co_code
-            )
+            return dict.__eq__(self, other)
+        if isinstance(other, Clifford):
+            return type(self).algebra_fingerprint() == type(other).algebra_fingerprint() and dict.__eq__(self, other)
         return NotImplemented
 
     def __hash__(self):
-        """Overrides the default implementation"""
-        return hash(tuple(sorted(self.__dict__.items())))
+        """
+		Hash of :py:meth:`algebra_fingerprint` and the (nonzero) terms, cached until self is mutated
+		"""
+        if "_content_hash" not in self.__dict__:
+            self.__dict__["_content_hash"] = hash(
+                (
+                    type(self).algebra_fingerprint(),
+                    frozenset((Tensor._merge_keys(key), value) for key, value in self.items() if value != 0),
+                )
+            )
+        return self.__dict__["_content_hash"]
+
+    # region mutation (invalidates the cached hash)
+
+    def __setitem__(self, key, value):
+        self.__dict__.pop("_content_hash", None)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.__dict__.pop("_content_hash", None)
+        super().__delitem__(key)
+
+    def clear(self):
+        self.__dict__.pop("_content_hash", None)
+        super().clear()
+
+    def update(self, *args, **kwargs):
+        self.__dict__.pop("_content_hash", None)
+        super().update(*args, **kwargs)
+
+    def pop(self, *args):
+        self.__dict__.pop("_content_hash", None)
+        return super().pop(*args)
+
+    def popitem(self):
+        self.__dict__.pop("_content_hash", None)
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self.__dict__.pop("_content_hash", None)
+        return super().setdefault(key, default)
+
+    # endregion
 
     def quotient(self):
         r"""
@@ -141,106 +213,377 @@ class Clifford(Tensor):
 
     # region simplification
 
-    def find_first_key_with_duplicate_slots_and_their_indices(self):
-        for key_self in self.keys():
-            duplicate_slot_in_key_to_indices = {
-                slot: [i for i, slot_i in enumerate(key_self) if slot_i == slot] for slot in set(key_self)
-            }
-            for _, indices in duplicate_slot_in_key_to_indices.items():
-                if len(indices) > 1:
-                    return namedtuple("key_with_indices", ["key", "indices"])(key=key_self, indices=indices)
-        return None
+    @classmethod
+    def bilinear_form_values(cls):
+        """
+		:return: dict from (slot, slot) to the values of ``symmetric_bilinear_form`` computed so far
+		"""
+        if "_bilinear_form_values" not in cls.__dict__:
+            cls._bilinear_form_values = dict()
+        return cls._bilinear_form_values
+
+    @classmethod
+    def canonical_terms(cls, key):
+        r"""
+		Brings a product of slots to canonical form (distinct slots, sorted by repr) in one insertion sort pass.
+		Adjacent slots out of order are swapped with
 
-    def equal_slots_reduced_yet(self):
+		.. math::
+			u\otimes v = -v\otimes u + 2\langle u,v\rangle_Q 1
+
+		where the second term is put on a worklist, and equal adjacent slots are contracted with
+
+		.. math::
+			u\otimes u = Q(u)1
+
+		:param key: key (tuple of slots)
+		:return: dict from canonical key to coefficient
+		"""
+        values = cls.bilinear_form_values()
+
+        def bilinear_form(slot_i, slot_j):
+            if (slot_i, slot_j) not in values:
+                values[(slot_i, slot_j)] = cls.symmetric_bilinear_form(slot_i, slot_j)
+            return values[(slot_i, slot_j)]
+
+        order = dict()
+
+        def precedes(slot_i, slot_j):
+            for slot in (slot_i, slot_j):
+                if slot not in order:
+                    order[slot] = repr(slot)
+            return order[slot_i] < order[slot_j]
+
+        terms = dict()
+        worklist = [(list(key), 1)]
+        while worklist:
+            slots, coefficient = worklist.pop()
+            index = 1
+            while index < len(slots) and coefficient != 0:
+                slot_i, slot_j = slots[index - 1], slots[index]
+                if slot_i == slot_j:
+                    coefficient = coefficient * bilinear_form(slot_i, slot_j)
+                    del slots[index - 1 : index + 1]
+                    index = max(index - 1, 1)
+                elif precedes(slot_j, slot_i):
+                    inner_product = bilinear_form(slot_i, slot_j)
+                    if inner_product != 0:
+                        worklist.append((slots[: index - 1] + slots[index + 1 :], 2 * inner_product * coefficient))
+                    slots[index - 1], slots[index] = slot_j, slot_i
+                    coefficient = -coefficient
+                    index = max(index - 1, 1)
+                else:
+                    index += 1
+            if coefficient != 0:
+                canonical_key = tuple(slots)
+                terms[canonical_key] = terms[canonical_key] + coefficient if canonical_key in terms else coefficient
+        return terms
+
+    def simplify(self):
         """
-		[summary]
-		NOTE: returns False if it mutated self, otherwise True
-		"""
-        already_reduced = True
-        while True:
-            key_with_duplicate_slots_and_their_indices = self.find_first_key_with_duplicate_slots_and_their_indices()
-            if key_with_duplicate_slots_and_their_indices:
-                permutation = key_with_duplicate_slots_and_their_indices.indices + [
-                    slot_index
-                    for slot_index in range(0, len(key_with_duplicate_slots_and_their_indices.key))
-                    if slot_index not in key_with_duplicate_slots_and_their_indices.indices
-                ]
-                self.braiding_map(permutation).quotient().without_zeros()
-                already_reduced = False
-            else:
-                break
-        return already_reduced
+		Brings every term to canonical form with :py:meth:`canonical_terms` and drops vanishing terms.
 
-    def normalized_key_yet(self, key_normal_form):
-        """[summary]
-		NOTE: returns False if it mutated self, otherwise True
+		NOTE: mutates self and then returns self (to allow chains)
 
-		:param key_normal_form: [description]
-		:type key_normal_form: [type]
-		:return: [description]
-		:rtype: [type]
+		:return: self
+		:rtype: :py:class:`type(self)`
+		"""
+        terms = dict()
+        for key, value in self.items():
+            for canonical_key, factor in type(self).canonical_terms(Tensor._merge_keys(key)).items():
+                term = value if factor == 1 else factor * value
+                terms[canonical_key] = terms[canonical_key] + term if canonical_key in terms else term
+        self.clear()
+        self.update({key: value for key, value in terms.items() if value != 0})
+        return self._pruned(self)
+
+    @classmethod
+    def blade_algebra(cls, slots):
+        r"""
+		Bitmask encoded blades (see :py:class:`BladeAlgebra`) spanned by the given slots and the slots seen before,
+		available when the symmetric bilinear form is diagonal on them.
+		The basis is ordered as the slots in the keys of simplified multivectors (by repr).
+
+		:param slots: basis vectors
+		:return: :py:class:`BladeAlgebra`, or None if the symmetric bilinear form is not diagonal
 		"""
+        cached = cls.__dict__.get("_blade_algebra_cache")
+        if cached is not None and set(slots) <= cached[0]:
+            return cached[1]
+        basis = sorted((cached[0] if cached is not None else frozenset()) | set(slots), key=lambda slot: repr(slot))
+        values = [
+            value
+            for slot_i, slot_j in itertools.combinations(basis, 2)
+            for value in (cls.symmetric_bilinear_form(slot_i, slot_j), cls.symmetric_bilinear_form(slot_j, slot_i))
+        ]
+        try:
+            diagonal = all(bool(value == 0) for value in values)
+        except (TypeError, ValueError):
+            # values whose comparison with 0 has no truth value (e.g. sympy relationals, arrays)
+            diagonal = False
+        algebra = BladeAlgebra(basis, [cls.symmetric_bilinear_form(slot, slot) for slot in basis]) if diagonal else None
+        cls._blade_algebra_cache = (frozenset(basis), algebra)
+        return algebra
 
-        def first_key_not_in_normal_form(keys, key_normal_form):
-            for key in keys:
-                if key != key_normal_form and set(key) == set(key_normal_form):
-                    return key
-            return None
-
-        already_normalized = True
-        while True:
-            key_not_in_normal_form = first_key_not_in_normal_form(self.keys(), key_normal_form)
-            if key_not_in_normal_form:
-                slot_permutation = [key_normal_form.index(slot) for slot in key_not_in_normal_form]
-                other_summand_to_permute = type(self)({key_not_in_normal_form: self[key_not_in_normal_form]})
-                result = (
-                    (self - other_summand_to_permute + other_summand_to_permute.braiding_map(slot_permutation))
-                    .quotient()
-                    .without_zeros()
-                )
-                self.clear()
-                self.update(result)
-                already_normalized = False
-            else:
-                return already_normalized
+    @classmethod
+    def cayley_table(cls):
+        """
+		Products of pairs of keys computed so far by :py:meth:`blade_product`, in least recently used order.
+		Each class (e.g. made with :py:func:`mathematics.algebra.create.create_clifford`) has its own table,
+		holding at most ``cayley_table_size`` products.
 
-    def simplified_yet(self):
-        """[summary]
-		NOTE: returns False if it mutated self, otherwise True
+		NOTE: the table is not invalidated if ``symmetric_bilinear_form`` is reassigned on the class.
 
-		:return: [description]
-		:rtype: [type]
+		:return: dict from (lhs key, rhs key) to the simplified product as tuple of (key, coefficient)
 		"""
+        if "_cayley_table" not in cls.__dict__:
+            cls._cayley_table = OrderedDict()
+        return cls._cayley_table
 
-        maybe = self.equal_slots_reduced_yet()
-        if maybe:
-            for key_self in self.keys():
-                normalized_key = (
-                    key_self if len(key_self) == 1 else type(key_self)(sorted(key_self, key=lambda k: repr(k)))
-                )
-                maybe = maybe and self.normalized_key_yet(normalized_key)
-                if maybe:
-                    continue
-                else:
-                    break
-        return maybe
+    @classmethod
+    def blade_product(cls, lhs_key, rhs_key):
+        """
+		Simplified product of two keys, looked up in (or added to) :py:meth:`cayley_table`.
 
-    def simplify(self):
-        """[summary]
-		NOTE: mutates self if necessary and then returns self (to allow chains)
+		:param lhs_key: key (tuple of slots)
+		:param rhs_key: key (tuple of slots)
+		:return: tuple of (key, nonzero coefficient)
+		"""
+        table = cls.cayley_table()
+        pair = (lhs_key, rhs_key)
+        if pair in table:
+            table.move_to_end(pair)
+            return table[pair]
+        product = cls({Tensor._merge_keys(lhs_key, rhs_key): 1}).simplify()
+        table[pair] = tuple((key, value) for key, value in product.items() if value != 0)
+        while len(table) > cls.cayley_table_size:
+            table.popitem(last=False)
+        return table[pair]
 
-		:return: [description]
-		:rtype: [type]
+    @classmethod
+    def precompute_cayley_table(cls, basis):
+        """
+		Fills :py:meth:`cayley_table` with the products of all pairs of basis blades
+		(the table should hold :math:`4^n` products for :math:`n` basis vectors).
+
+		:param basis: basis vectors
+		:return: :py:meth:`cayley_table`
 		"""
-        while not self.simplified_yet():
-            pass
-        return self
+        blades = [
+            tuple(sorted(combination, key=lambda slot: repr(slot)))
+            for grade in range(0, len(basis) + 1)
+            for combination in itertools.combinations(basis, grade)
+        ]
+        for lhs_key in blades:
+            for rhs_key in blades:
+                cls.blade_product(lhs_key, rhs_key)
+        return cls.cayley_table()
+
+    def _blade_algebra_terms(self, *others):
+        """
+		:return: (:py:meth:`blade_algebra` of the slots of self and others (or None),
+			terms of self and others as lists of (key, value))
+		"""
+        terms = [
+            [(key if type(key) is tuple else Tensor._merge_keys(key), value) for key, value in multivector.items()]
+            for multivector in (self,) + others
+        ]
+        algebra = type(self).blade_algebra({slot for keys in terms for key, _ in keys for slot in key})
+        return algebra, terms
+
+    def _encoded(self, *others):
+        algebra, terms = self._blade_algebra_terms(*others)
+        if algebra is None:
+            raise NotImplementedError(
+                "grades are only defined on canonical keys when the symmetric bilinear form is diagonal"
+            )
+        return algebra, [algebra.encoded(keys) for keys in terms]
+
+    def _collected(self, terms):
+        """
+		:param terms: dict from key to the coefficient collected from all contributions to the key
+		:return: multivector, with ``coefficient_simplifier`` applied once per symbolic coefficient
+		"""
+        simplifier = type(self).coefficient_simplifier
+        if simplifier is not None:
+            terms = {
+                key: simplifier(value) if getattr(value, "free_symbols", None) else value for key, value in terms.items()
+            }
+            terms = {key: value for key, value in terms.items() if value != 0}
+        return self._pruned(type(self)(terms))
+
+    def _decoded(self, algebra, multivector):
+        return self._collected(algebra.decoded(multivector))
+
+    @classmethod
+    def product_cache(cls):
+        """
+		Products of pairs of multivectors computed so far, in least recently used order.
+		Used by :py:meth:`__mul__` when ``product_cache_size`` is positive (and the coefficients are hashable),
+		e.g. for repeated sub-products of symbolic expressions.
+
+		:return: dict from (lhs terms, rhs terms) to the terms of the product
+		"""
+        if "_product_cache" not in cls.__dict__:
+            cls._product_cache = OrderedDict()
+        return cls._product_cache
 
     def __mul__(self, other):
         """
 		Clifford product
+
+		NOTE: multiplies the bitmask encoded blades of :py:meth:`blade_algebra` if the symmetric bilinear form is diagonal,
+		otherwise multiplies term by term with the products of keys in :py:meth:`cayley_table`.
+		The coefficients are collected per blade before ``coefficient_simplifier`` (e.g. :py:func:`sympy.expand`),
+		if set on the class, is applied to them.
+		"""
+        pair = None
+        if type(self).product_cache_size > 0 and isinstance(other, type(self)):
+            try:
+                pair = (frozenset(self.items()), frozenset(other.items()))
+                hash(pair)
+            except TypeError:
+                pair = None
+        if pair is not None:
+            cache = type(self).product_cache()
+            if pair in cache:
+                cache.move_to_end(pair)
+                return self._pruned(type(self)(cache[pair]))
+        product = self._product(other)
+        if pair is not None:
+            cache[pair] = dict(product)
+            while len(cache) > type(self).product_cache_size:
+                cache.popitem(last=False)
+        return product
+
+    def _product(self, other):
+        is_multivector = isinstance(other, type(self))
+        algebra, terms = self._blade_algebra_terms(*((other,) if is_multivector else ()))
+        if algebra is None:
+            if not is_multivector:
+                return type(self)(super().__mul__(other)).simplify()
+            product = dict()
+            for key, value in terms[0]:
+                for other_key, other_value in terms[1]:
+                    coefficient = value * other_value
+                    for product_key, factor in type(self).blade_product(key, other_key):
+                        term = factor * coefficient
+                        product[product_key] = product[product_key] + term if product_key in product else term
+            return self._collected({key: value for key, value in product.items() if value != 0})
+        multivector = algebra.encoded(terms[0])
+        if is_multivector:
+            product = algebra.product(multivector, algebra.encoded(terms[1]))
+        else:
+            product = {mask: value * other for mask, value in multivector.items()}
+        return self._decoded(algebra, product)
+
+    def lambdify(self, symbols, keys=None):
+        """
+		Converts a multivector with symbolic coefficients to a numpy function.
+		Common subexpressions of the coefficients are computed once (:py:func:`sympy.lambdify` with ``cse=True``,
+		for sympy versions that support it).
+
+		:param symbols: symbols that are the arguments of the function
+		:param keys: keys of the coefficients to evaluate, defaults to the keys of self
+		:return: function from values of the symbols (scalars or broadcastable arrays) to an array of shape
+			(..., len(keys)) with the coefficients in the order of keys
+		"""
+        terms = dict()
+        for key, value in self.items():
+            key = Tensor._merge_keys(key)
+            terms[key] = terms[key] + value if key in terms else value
+        keys = list(terms) if keys is None else [Tensor._merge_keys(key) for key in keys]
+        function = _sympy.lambdify(symbols, [terms.get(key, 0) for key in keys], modules="numpy", **_lambdify_cse)
+
+        def evaluate(*values):
+            return _np.stack(_np.broadcast_arrays(*function(*values)), axis=-1)
+
+        evaluate.keys = keys
+        return evaluate
+
+    # endregion
+
+    # region graded operations
+
+    def grade(self, k):
+        r"""
+		Grade projection :math:`\langle A\rangle_k`
+
+		NOTE: the graded operations need a symmetric bilinear form that is diagonal on the slots,
+		otherwise :py:class:`NotImplementedError` is raised (except for the involutions).
+
+		:param k: grade
+		:return: the terms of grade k
+		:rtype: :py:class:`type(self)`
+		"""
+        algebra, (multivector,) = self._encoded()
+        return self._decoded(algebra, algebra.grade_projection(multivector, k))
+
+    def graded(self):
+        """
+		:return: dict from grade to the terms of that grade
+		"""
+        algebra, (multivector,) = self._encoded()
+        return {grade: self._decoded(algebra, terms) for grade, terms in algebra.graded(multivector).items()}
+
+    def reverse(self):
+        r"""
+		Reversion :math:`(u_1\cdots u_k)^{\sim} = u_k\cdots u_1`
+		"""
+        algebra, terms = self._blade_algebra_terms()
+        if algebra is None:
+            return type(self)({tuple(reversed(key)): value for key, value in terms[0]}).simplify()
+        return self._decoded(algebra, algebra.reverse(algebra.encoded(terms[0])))
+
+    def grade_involution(self):
+        r"""
+		Grade involution :math:`(u_1\cdots u_k)^{\wedge} = (-1)^k u_1\cdots u_k`
+		"""
+        algebra, terms = self._blade_algebra_terms()
+        if algebra is None:
+            return type(self)({key: -value if len(key) & 1 else value for key, value in terms[0]}).simplify()
+        return self._decoded(algebra, algebra.grade_involution(algebra.encoded(terms[0])))
+
+    def conjugate(self):
+        r"""
+		Clifford conjugation, i.e. reversion composed with grade involution
+		"""
+        algebra, terms = self._blade_algebra_terms()
+        if algebra is None:
+            return self.reverse().grade_involution()
+        return self._decoded(algebra, algebra.conjugate(algebra.encoded(terms[0])))
+
+    def wedge(self, other):
+        r"""
+		Outer (exterior) product :math:`A\wedge B`
+
+		NOTE: not named ``outer_product``, which is the tensor product inherited from :py:class:`Tensor`.
+		"""
+        algebra, (multivector, other_multivector) = self._encoded(other)
+        return self._decoded(algebra, algebra.outer_product(multivector, other_multivector))
+
+    def left_contraction(self, other):
+        r"""
+		Left contraction :math:`A\rfloor B`, the grade :math:`s-r` part of :math:`\langle A\rangle_r\langle B\rangle_s`
+		"""
+        algebra, (multivector, other_multivector) = self._encoded(other)
+        return self._decoded(algebra, algebra.left_contraction(multivector, other_multivector))
+
+    def right_contraction(self, other):
+        r"""
+		Right contraction :math:`A\lfloor B`, the grade :math:`r-s` part of :math:`\langle A\rangle_r\langle B\rangle_s`
+		"""
+        algebra, (multivector, other_multivector) = self._encoded(other)
+        return self._decoded(algebra, algebra.right_contraction(multivector, other_multivector))
+
+    def scalar_product(self, other):
+        r"""
+		Scalar product :math:`A * B = \langle AB\rangle_0`
+
+		:return: scalar
 		"""
-        return type(self)(super().__mul__(other)).simplify()
+        algebra, (multivector, other_multivector) = self._encoded(other)
+        return algebra.scalar_product(multivector, other_multivector).get(0, 0)
 
 
 # endregion
@@ -1,11 +1,12 @@
-import functools as _functools
 import itertools as _itertools
-import operator as _operator
+import multiprocessing as _multiprocessing
 
+import numpy as _np
 import sympy
 
 from .clifford import Clifford
 from .pointwise import Pointwise
+from .symmetric_tensor import SymmetricTensor
 
 
 def class_factory(name, *baseclasses, **kwargs):
@@ -17,11 +18,21 @@ def class_factory(name, *baseclasses, **kwargs):
         return globals()[name]
 
 
-def create_clifford(name, symmetric_bilinear_form):
-    return class_factory(name, Clifford, symmetric_bilinear_form=symmetric_bilinear_form)
+def create_clifford(name, symmetric_bilinear_form, **attributes):
+    """
+	:param attributes: further class attributes, e.g. ``coefficient_simplifier=sympy.expand`` or ``product_cache_size``
+	"""
+    return class_factory(name, Clifford, symmetric_bilinear_form=symmetric_bilinear_form, **attributes)
+
+
+def create_symmetric_tensor(name, *slot_symmetries):
+    """
+	:param slot_symmetries: see :py:mod:`mathematics.algebra.symmetric_tensor`, e.g. ``antisymmetric()`` for forms
+	"""
+    return class_factory(name, SymmetricTensor, slot_symmetries=tuple(slot_symmetries))
 
 
-def multilinear_mapping_as_tensor(cls, slot_to_dual, *bases):
+def multilinear_mapping_as_tensor(cls, slot_to_dual, *bases, processes=None, vectorized=False):
     r"""
 	Expands multilinear function as tensor.
 	NOTE: not sure if the math is valid for vector valued multilinear mappings.
@@ -29,6 +40,13 @@ def multilinear_mapping_as_tensor(cls, slot_to_dual, *bases):
 	:param slot_to_dual:	Converts a (basis-)vector to its corresponding dual
 	:param *bases:			tuple where each element is an ordered basis.
 							Each ordered basis appears in same order as in the function call.
+	:param cls:				Tensor type of the result.
+							If it has a ``canonical_key`` (e.g. :py:class:`SymmetricTensor`) the mapping is only
+							evaluated for canonical keys.
+	:param processes:		if given, the mapping is evaluated in a process pool of that size
+							(the mapping must be picklable, e.g. a module level function).
+	:param vectorized:		if True, the mapping is called once, with one array per slot where row :math:`n`
+							is the basis vector of the :math:`n`:th combination, and returns an array of values.
 	:return:				Returns a lambda with domain over (scalar or vector-valued-)multilinear functions.
 
 	.. math::
@@ -43,25 +61,33 @@ def multilinear_mapping_as_tensor(cls, slot_to_dual, *bases):
 
 	:rtype: [type]
 	"""
-    return lambda multilinear_mapping: _functools.reduce(
-        _operator.add,
-        [
-            cls(
-                {
-                    tuple(
-                        slot_to_dual(bases[base_index][base_index_to_basis_index[base_index]])
-                        for base_index in range(0, len(bases))
-                    ): multilinear_mapping(
-                        *[
-                            bases[base_index][base_index_to_basis_index[base_index]]
-                            for base_index in range(0, len(bases))
-                        ]
-                    )
-                }
+    duals = [tuple(slot_to_dual(base) for base in basis) for basis in bases]
+    canonical_key = getattr(cls, "canonical_key", None)
+    keys = list()
+    arguments = list()
+    for base_index_to_basis_index in _itertools.product(*[range(0, len(basis)) for basis in bases]):
+        key = tuple(duals[base_index][basis_index] for base_index, basis_index in enumerate(base_index_to_basis_index))
+        if canonical_key is None or canonical_key(key) == (key, 1):
+            keys.append(key)
+            arguments.append(
+                tuple(bases[base_index][basis_index] for base_index, basis_index in enumerate(base_index_to_basis_index))
             )
-            for base_index_to_basis_index in _itertools.product(*[range(0, len(basis)) for basis in bases])
-        ],
-    )
+
+    def as_tensor(multilinear_mapping):
+        if vectorized:
+            values = multilinear_mapping(*[_np.asarray(slot_arguments) for slot_arguments in zip(*arguments)])
+            values = values.tolist() if isinstance(values, _np.ndarray) else list(values)
+        elif processes:
+            with _multiprocessing.Pool(processes) as pool:
+                values = pool.starmap(multilinear_mapping, arguments, chunksize=max(1, len(arguments) // (4 * processes)))
+        else:
+            values = [multilinear_mapping(*argument) for argument in arguments]
+        terms = dict()
+        for key, value in zip(keys, values):
+            terms[key] = terms[key] + value if key in terms else value
+        return cls(terms)
+
+    return as_tensor
 
 
 def kronecker_delta_tensor(cls, basis, slot_to_dual):
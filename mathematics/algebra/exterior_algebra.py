@@ -1,64 +1,217 @@
+import functools as _functools
 import itertools as _itertools
 import math as _math
+
+import numpy as _np
+
 from ..algebra.matrix import Matrix
 from ..algebra.tensor import Tensor
-from ..algebra.clifford import Clifford
-from ..number_theory.combinatorics import sign, parity, apply_permutation, riffle_shuffles, permutation_symbol
+from ..algebra.symmetric_tensor import SymmetricTensor, antisymmetric
+from ..algebra.symmetric_tensor import _slot_order
+from ..number_theory.combinatorics import sign, permutation_symbol
 
 # clifford algebra with Q = 0?
 
 
+class Form(SymmetricTensor):
+    r"""
+    Antisymmetric tensor, storing one component per set of slots (in increasing order).
+
+    The component :math:`\alpha_{i_1\ldots i_k}` (:math:`i_1<\ldots<i_k`) is the coefficient of
+    :math:`\mathbf{e}^{i_1}\wedge\cdots\wedge\mathbf{e}^{i_k}`,
+    i.e. :math:`\alpha(\mathbf{e}_{i_1},\ldots,\mathbf{e}_{i_k})`.
+    """
+
+    slot_symmetries = (antisymmetric(),)
+
+
+def _merged(lhs_key, rhs_key):
+    """
+    Merges two increasing keys with sign tracking.
+
+    :return: (merged key, sign of the permutation that sorts ``lhs_key + rhs_key``), sign is 0 if the keys intersect
+    """
+    merged = list()
+    swaps = 0
+    i = 0
+    j = 0
+    while i < len(lhs_key) and j < len(rhs_key):
+        lhs_order = _slot_order(lhs_key[i])
+        rhs_order = _slot_order(rhs_key[j])
+        if lhs_order == rhs_order:
+            return None, 0
+        if rhs_order < lhs_order:
+            merged.append(rhs_key[j])
+            swaps += len(lhs_key) - i
+            j += 1
+        else:
+            merged.append(lhs_key[i])
+            i += 1
+    merged.extend(lhs_key[i:])
+    merged.extend(rhs_key[j:])
+    return tuple(merged), -1 if swaps & 1 else 1
+
+
 def exterior_product(a: Tensor, b: Tensor):
-    k = len(a.keys())
-    m = len(b.keys())
-    result = Tensor()
-    for permutation in riffle_shuffles(range(0, k), range(k, k + m)):
-        addend = parity(permutation)
-        for akey in apply_permutation(list(a.keys()), permutation[0:k]):
-            addend = addend * a[akey]
-        for bkey in apply_permutation(list(b.keys()), [p - k for p in permutation[k:]]):
-            addend = addend * b[bkey]
-        result = result + addend
+    r"""
+    Exterior (wedge) product of forms
+
+    .. math::
+        (\alpha\wedge\beta)_K = \sum_{I\cup J=K} \operatorname{sgn}(I,J)\,\alpha_I\,\beta_J
+
+    where :math:`\operatorname{sgn}(I,J)` is the sign of the permutation that sorts the indices :math:`I,J`.
+
+    :param a: form (a :py:class:`Tensor` is converted to a :py:class:`Form`)
+    :param b: form (a :py:class:`Tensor` is converted to a :py:class:`Form`)
+    :return: :math:`a\wedge b`
+    :rtype: :py:class:`Form`
+    """
+    a = a if isinstance(a, Form) else Form(a)
+    b = b if isinstance(b, Form) else Form(b)
+    result = Form()
+    for a_key, a_value in a.items():
+        for b_key, b_value in b.items():
+            key, key_sign = _merged(a_key, b_key)
+            if not key_sign:
+                continue
+            value = a_value * b_value if key_sign == 1 else -(a_value * b_value)
+            if dict.__contains__(result, key):
+                dict.__setitem__(result, key, dict.__getitem__(result, key) + value)
+            else:
+                dict.__setitem__(result, key, value)
+    return result
+
+
+def form_basis(dimension, degree):
+    """
+    :return: increasing index tuples of the components of a ``degree``-form, in the order of the arrays of
+        :py:func:`exterior_product_arrays`
+    """
+    return list(_itertools.combinations(range(0, dimension), degree))
+
+
+@_functools.lru_cache(maxsize=2 ** 8)
+def _exterior_product_structure_constants(dimension, lhs_degree, rhs_degree):
+    lhs_basis = form_basis(dimension, lhs_degree)
+    rhs_basis = form_basis(dimension, rhs_degree)
+    index = {key: position for position, key in enumerate(form_basis(dimension, lhs_degree + rhs_degree))}
+    constants = _np.zeros((len(lhs_basis), len(rhs_basis), len(index)))
+    for i, lhs_key in enumerate(lhs_basis):
+        for j, rhs_key in enumerate(rhs_basis):
+            key, key_sign = _merged(lhs_key, rhs_key)
+            if key_sign:
+                constants[i, j, index[key]] = key_sign
+    constants.setflags(write=False)
+    return constants
+
+
+def exterior_product_arrays(a, b, dimension, lhs_degree, rhs_degree):
+    """
+    Exterior product of arrays of forms at once.
+
+    :param a: array of shape (..., C(dimension, lhs_degree)) with the components of ``lhs_degree``-forms,
+        ordered as :py:func:`form_basis`
+    :param b: array of shape (..., C(dimension, rhs_degree)), broadcast against a
+    :return: array of shape (..., C(dimension, lhs_degree + rhs_degree))
+    """
+    constants = _exterior_product_structure_constants(dimension, lhs_degree, rhs_degree)
+    return _np.einsum("...i,...j,ijk->...k", a, b, constants)
 
 
 # hodge star and so on
 
 
-def hodge_star(g: Matrix, a: Clifford, n: int):
+def _metric_array(g):
+    return _np.asarray(g, dtype=float)
+
+
+@_functools.lru_cache(maxsize=2 ** 8)
+def _hodge_star_operator(metric_bytes, dimension, degree):
+    g = _np.frombuffer(metric_bytes, dtype=float).reshape(dimension, dimension)
+    inverse_metric = _np.linalg.inv(g)
+    volume = _math.sqrt(abs(_np.linalg.det(g)))
+    keys = form_basis(dimension, degree)
+    basis = _np.array(keys, dtype=int).reshape(len(keys), degree)
+    # compound matrix: minors of the inverse metric, raises the indices of the k-form
+    minors = inverse_metric[basis[:, None, :, None], basis[None, :, None, :]]
+    compound = _np.linalg.det(minors) if degree else _np.ones((1, 1))
+    position = {key: index for index, key in enumerate(form_basis(dimension, dimension - degree))}
+    operator = _np.zeros((len(position), len(basis)))
+    for index, key in enumerate(keys):
+        complement = tuple(slot for slot in range(0, dimension) if slot not in key)
+        operator[position[complement]] = permutation_symbol(*(key + complement)) * volume * compound[index]
+    operator.setflags(write=False)
+    return operator
+
+
+def hodge_star_operator(g, degree):
+    r"""
+    Hodge star on ``degree``-forms as a (cached) linear operator on their components (ordered as :py:func:`form_basis`)
+
+    .. math::
+        (\star\alpha)_{J} = \sqrt{|\det g|}\,\varepsilon_{IJ}\,\alpha^{I},
+        \quad \alpha^{I} = \sum_K \det\left((g^{-1})_{IK}\right)\alpha_K
+
+    where :math:`I` is the (increasing) complement of :math:`J`. :math:`\sqrt{|\det g|}`, the minors of the inverse
+    metric and the complementary indices are computed once per (metric, degree).
+
+    :param g: metric (:py:class:`Matrix` or array)
+    :param degree: degree of the forms
+    :return: array of shape (C(n, n - degree), C(n, degree)), read only
     """
-    hodge_star [summary]
+    g = _metric_array(g)
+    return _hodge_star_operator(g.tobytes(), g.shape[0], degree)
+
+
+def _degree(a: Tensor):
+    degrees = {len(Tensor._merge_keys(key)) for key in a.keys()}
+    if len(degrees) > 1:
+        raise ValueError("form of mixed degrees: {0}".format(sorted(degrees)))
+    return degrees.pop() if degrees else None
+
 
-    NOTE: this will not work at all unless the keys are tuples of integers zero indexed ... TODO: figure out how to generalise
+def hodge_star(g: Matrix, a, n: int, degree=None):
+    r"""
+    hodge_star, see :py:func:`hodge_star_operator`
+
+    NOTE: the keys are tuples of zero indexed integers (the indices of the basis)
 
     :param g: Metric for V, note it is not for dual V*, if you want that you need to sharpen the metric (if I understood this? https://www.homotopico.com/2019/06/10/hodge-star.html)
     :type g: Matrix
-    :param a: [description]
-    :type a: Clifford
-    :param volume: [description]
-    :type volume: Clifford
+    :param a: form (a :py:class:`Tensor` is converted to a :py:class:`Form`), or array of shape (..., C(n, degree))
+        with the components of many forms
+    :param n: dimension
+    :param degree: degree of the forms, only needed for arrays
+    :return: :math:`\star a`, of the same kind as a
+    """
+    if isinstance(a, Tensor):
+        a = a if isinstance(a, Form) else Form(a)
+        degree = _degree(a)
+        if degree is None:
+            return Form()
+        operator = hodge_star_operator(g, degree)
+        components = _np.zeros(operator.shape[1], dtype=_np.result_type(operator, *a.values()))
+        position = {key: index for index, key in enumerate(form_basis(n, degree))}
+        for key, value in a.items():
+            components[position[key]] = value
+        return Form(
+            (key, value) for key, value in zip(form_basis(n, n - degree), (operator @ components).tolist()) if value
+        )
+    return _np.asarray(a) @ hodge_star_operator(g, degree).T
+
+
+def hodge_star_inverse(g: Matrix, a, n: int, degree=None):
+    r"""
+    .. math::
+        \star^{-1} = (-1)^{k(n-k)}\operatorname{sgn}(\det g)\star
+
+    on :math:`k`-forms, see :py:func:`hodge_star`.
     """
-    result = Clifford()
-    akeys = list(a.keys())
-    for permutation in _itertools.permutations(range(0, n)):
-        head = tuple(permutation[0 : len(akeys)])
-        tail = tuple(permutation[len(akeys) :])
-        if head in akeys:
-            result[tail] = (
-                1.0
-                / (
-                    _math.sqrt(abs(Matrix.determinant(g)))
-                    * _math.gamma(len(akeys) + 1)
-                    * _math.gamma(n - len(akeys) + 1)
-                )
-                * a[head]
-                * permutation_symbol(*permutation)
-            )
-
-
-def hodge_star_inverse(g: Matrix, a: Clifford, n: int):
-    k = len(a.keys())
-    s = sign(Matrix.determinant(g))
-    return ((-1) ** (k * (n - k))) * s * hodge_star(g, a, n)
+    degree = _degree(a) if isinstance(a, Tensor) else degree
+    if degree is None:
+        return Form()
+    s = sign(_np.linalg.det(_metric_array(g)))
+    return ((-1) ** (degree * (n - degree))) * s * hodge_star(g, a, n, degree)
 
 
 #def codifferential(g: Matrix, a: Clifford, n: int):
@@ -0,0 +1,295 @@
+"""
+Lazy tensor expressions
+"""
+
+__all__ = ["LazyTensor"]
+import itertools as _itertools
+
+from .dual import Dual as _Dual
+from .tensor import Tensor as _Tensor
+
+
+def _identity(parameter):
+    try:
+        hash(parameter)
+        return ("value", type(parameter), parameter)
+    except TypeError:
+        return ("id", id(parameter))
+
+
+def _is_zero(value):
+    try:
+        return bool(value == 0)
+    except (TypeError, ValueError):
+        return False
+
+
+def _is_zero_node(node):
+    return node.operation == "sum" and not node.operands
+
+
+class LazyTensor:
+    r"""
+    Node in a tensor expression DAG that is only evaluated on demand.
+
+    Leaves wrap a :py:class:`Tensor`, every other node records an operation on its operands:
+
+    * ``"sum"``: :math:`\mathsf{A}_1 + \ldots + \mathsf{A}_n`
+    * ``"scale"``: :math:`c\cdot\mathsf{A}` (``side`` tells whether the scalar was multiplied from the left or right)
+    * ``"contraction"``: :math:`\mathsf{A}_1\otimes\ldots\otimes\mathsf{A}_n` followed by a sequence of traces
+
+    Before evaluation the DAG is optimised:
+
+    * traces of tensor products are fused into one contraction, so the product is never materialised
+      and terms where a pairing vanishes are dropped before their coefficients are multiplied,
+    * structurally equal subexpressions are merged (common-subexpression elimination),
+    * nested sums and products are flattened, zero terms and zero scalings are dropped early.
+
+    NOTE: zero coefficients are dropped while evaluating, unlike the eager operations on :py:class:`Tensor`;
+    a pruning policy set on the tensor class is applied as well.
+
+    NOTE: contractions are only fused for tensor types using the braiding of :py:class:`Tensor`,
+    other types (e.g. :py:class:`Clifford`) are evaluated with their own eager operations.
+    """
+
+    def __init__(self, operation, operands=(), parameters=None):
+        self.operation = operation
+        self.operands = tuple(operands)
+        self.parameters = parameters
+
+    @classmethod
+    def leaf(cls, tensor):
+        return cls("tensor", (), tensor)
+
+    @classmethod
+    def _wrapped(cls, operand):
+        return operand if isinstance(operand, LazyTensor) else cls.leaf(operand)
+
+    def __repr__(self):
+        return "{0}({1})".format(type(self).__name__, self.operation)
+
+    # region algebraic operations
+
+    def __add__(self, B):
+        return type(self)("sum", (self, type(self)._wrapped(B)))
+
+    def __radd__(self, B):
+        # the start value of sum()
+        if not isinstance(B, (LazyTensor, _Tensor)) and _is_zero(B):
+            return self
+        return type(self)("sum", (type(self)._wrapped(B), self))
+
+    def __neg__(self):
+        return type(self)("scale", (self,), (-1, "left"))
+
+    def __sub__(self, B):
+        return self + (-type(self)._wrapped(B))
+
+    def __rsub__(self, B):
+        return type(self)._wrapped(B) + (-self)
+
+    def __rmul__(self, scalar):
+        return type(self)("scale", (self,), (scalar, "left"))
+
+    def __mul__(self, B):
+        if isinstance(B, (LazyTensor, _Tensor)):
+            return type(self)("contraction", (self, type(self)._wrapped(B)), ())
+        return type(self)("scale", (self,), (B, "right"))
+
+    def trace(self, first_slot_index, second_slot_index, pairing=None):
+        """
+        Deferred :py:meth:`Tensor.trace`
+        """
+        pairing = _Dual.default_pairing if pairing is None else pairing
+        return type(self)("contraction", (self,), ((first_slot_index, second_slot_index, pairing),))
+
+    # endregion
+
+    # region optimisation
+
+    def optimized(self):
+        """
+        Rewrites the DAG (see class documentation); the rewritten DAG shares structurally equal nodes.
+
+        :return: optimised expression
+        :rtype: :py:class:`LazyTensor`
+        """
+        interned = dict()
+        rewritten = dict()
+
+        def intern(node):
+            if node.operation == "tensor":
+                key = ("tensor", id(node.parameters))
+            elif node.operation == "scale":
+                key = ("scale", _identity(node.parameters[0]), node.parameters[1], id(node.operands[0]))
+            else:
+                key = (
+                    node.operation,
+                    tuple(id(operand) for operand in node.operands),
+                    tuple((first, second, _identity(pairing)) for first, second, pairing in node.parameters or ()),
+                )
+            return interned.setdefault(key, node)
+
+        for node in self._topological_order():
+            operands = [rewritten[id(operand)] for operand in node.operands]
+            if node.operation == "tensor":
+                result = type(self)("sum", ()) if not node.parameters else node
+            elif node.operation == "sum":
+                summands = list()
+                for operand in operands:
+                    summands.extend(operand.operands if operand.operation == "sum" else [operand])
+                result = summands[0] if len(summands) == 1 else type(self)("sum", summands)
+            elif node.operation == "scale":
+                if _is_zero(node.parameters[0]) or _is_zero_node(operands[0]):
+                    result = type(self)("sum", ())
+                else:
+                    result = type(self)("scale", operands, node.parameters)
+            else:
+                factors = list()
+                traces = list()
+                if len(operands) == 1 and operands[0].operation == "contraction":
+                    factors.extend(operands[0].operands)
+                    traces.extend(operands[0].parameters)
+                else:
+                    for operand in operands:
+                        if operand.operation == "contraction" and not operand.parameters:
+                            factors.extend(operand.operands)
+                        else:
+                            factors.append(operand)
+                traces.extend(node.parameters)
+                if any(_is_zero_node(factor) for factor in factors):
+                    result = type(self)("sum", ())
+                else:
+                    result = type(self)("contraction", factors, tuple(traces))
+            rewritten[id(node)] = intern(result)
+        return rewritten[id(self)]
+
+    def _topological_order(self):
+        """
+        :return: the nodes of the DAG in post-order (operands before the nodes using them), each node once
+        """
+        order = list()
+        visited = set()
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+                continue
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            stack.append((node, True))
+            stack.extend((operand, False) for operand in reversed(node.operands))
+        return order
+
+    def plan(self):
+        """
+        Human readable evaluation plan of the optimised DAG, one line per (shared) node in evaluation order.
+
+        :return: plan
+        :rtype: str
+        """
+        order = self.optimized()._topological_order()
+        label = {id(node): "%{0}".format(number) for number, node in enumerate(order)}
+        lines = list()
+        for node in order:
+            operands = ", ".join(label[id(operand)] for operand in node.operands)
+            if node.operation == "tensor":
+                description = "tensor[{0} terms]".format(len(node.parameters))
+            elif node.operation == "scale":
+                description = "scale({0}, {1}, {2})".format(operands, node.parameters[0], node.parameters[1])
+            elif node.operation == "contraction":
+                description = "contraction({0}{1})".format(
+                    operands,
+                    "".join("; trace({0}, {1})".format(first, second) for first, second, _ in node.parameters),
+                )
+            else:
+                description = "sum({0})".format(operands)
+            lines.append("{0} = {1}".format(label[id(node)], description))
+        return "\n".join(lines)
+
+    # endregion
+
+    # region evaluation
+
+    def _tensor_type(self):
+        for node in self._topological_order():
+            if node.operation == "tensor" and isinstance(node.parameters, _Tensor):
+                return type(node.parameters.expanded())
+        return _Tensor
+
+    def evaluate(self):
+        """
+        Evaluates the optimised DAG, every shared node is evaluated once.
+
+        :return: the value of the expression
+        :rtype: [tensor]
+        """
+        cls = self._tensor_type()
+        fused = (
+            cls.trace is _Tensor.trace and cls.braiding_map is _Tensor.braiding_map and cls.__mul__ is _Tensor.__mul__
+        )
+        values = dict()
+        order = self.optimized()._topological_order()
+        for node in order:
+            operands = [values[id(operand)] for operand in node.operands]
+            if node.operation == "tensor":
+                value = cls(
+                    {key: value for key, value in node.parameters.expanded().items() if not _is_zero(value)}
+                )
+            elif node.operation == "sum":
+                value = cls()
+                for operand in operands:
+                    for key, coefficient in operand.items():
+                        value[key] = value[key] + coefficient if key in value else coefficient
+            elif node.operation == "scale":
+                scalar, side = node.parameters
+                value = scalar * operands[0] if side == "left" else operands[0] * scalar
+            elif fused:
+                value = LazyTensor._contract(cls, operands, node.parameters)
+            else:
+                value = operands[0]
+                for operand in operands[1:]:
+                    value = value * operand
+                for first_slot_index, second_slot_index, pairing in node.parameters:
+                    value = value.trace(first_slot_index, second_slot_index, pairing)
+            value = cls({key: coefficient for key, coefficient in value.items() if not _is_zero(coefficient)})
+            values[id(node)] = value if cls.pruning_policy is None else cls.pruning_policy.prune(value)
+        return values[id(order[-1])]
+
+    @staticmethod
+    def _contract(cls, factors, traces):
+        r"""
+        Tensor product of the factors followed by the traces, computed term by term without forming the product.
+
+        :param cls: tensor type of the result
+        :param factors: tensors
+        :param traces: sequence of (first slot index, second slot index, pairing) as in :py:meth:`Tensor.trace`
+        :return: contracted tensor
+        """
+        result = cls()
+        terms = [list(zip(_Tensor._normalized_keys(factor)[0], factor.values())) for factor in factors]
+        for combination in _itertools.product(*terms):
+            key = tuple(slot for factor_key, _ in combination for slot in factor_key)
+            pairing_factors = list()
+            for first_slot_index, second_slot_index, pairing in traces:
+                pairing_factor = pairing(key[first_slot_index], key[second_slot_index])
+                if _is_zero(pairing_factor):
+                    break
+                pairing_factors.append(pairing_factor)
+                key = tuple(
+                    slot
+                    for slot_index, slot in enumerate(key)
+                    if slot_index not in (first_slot_index, second_slot_index)
+                )
+            else:
+                coefficient = combination[0][1]
+                for _, factor_coefficient in combination[1:]:
+                    coefficient = coefficient * factor_coefficient
+                for pairing_factor in pairing_factors:
+                    coefficient = coefficient * pairing_factor
+                result[key] = result[key] + coefficient if key in result else coefficient
+        return result
+
+    # endregion
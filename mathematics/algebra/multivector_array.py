@@ -0,0 +1,192 @@
+r"""
+Arrays of multivectors of one Clifford algebra (over an orthogonal basis), stored as dense coefficient arrays
+"""
+
+__all__ = ["MultivectorArray"]
+import numpy as _np
+
+from .blade_algebra import BladeAlgebra as _BladeAlgebra
+
+
+class MultivectorArray:
+    r"""
+    Array of multivectors as an array of shape (..., :math:`2^n`), where the coefficient of the basis blade
+    :math:`\mathbf{e}_A` is at index :math:`A` of the last axis (see :py:class:`BladeAlgebra`).
+
+    Operations act element-wise over the leading axes (with broadcasting). The geometric product loops over the
+    :math:`2^n` blades of the left factor; for each blade :math:`\mathbf{e}_A` the products with all blades of the
+    right factor land on the permutation :math:`B\mapsto A\veebar B` of the last axis, so the whole batch is handled
+    in one array operation per blade.
+    """
+
+    # lets numpy arrays on the left defer to __rmul__ instead of broadcasting over the multivectors
+    __array_ufunc__ = None
+
+    def __init__(self, algebra, coefficients):
+        """
+        :param algebra: :py:class:`BladeAlgebra`
+        :param coefficients: array of shape (..., :math:`2^n`)
+        """
+        self.algebra = algebra
+        self.coefficients = _np.asarray(coefficients)
+        if self.coefficients.shape[-1:] != (1 << algebra.dimension,):
+            raise ValueError(
+                "expected coefficients of shape (..., {0}), got {1}".format(
+                    1 << algebra.dimension, self.coefficients.shape
+                )
+            )
+
+    def __repr__(self):
+        return "{0}({1}, shape={2})".format(type(self).__name__, self.algebra, self.shape)
+
+    @property
+    def shape(self):
+        return self.coefficients.shape[:-1]
+
+    def __len__(self):
+        return len(self.coefficients)
+
+    def __getitem__(self, index):
+        return type(self)(self.algebra, self.coefficients[index])
+
+    # region conversion
+
+    @classmethod
+    def from_multivectors(cls, multivectors, algebra=None, dtype=float):
+        """
+        :param multivectors: sequence of :py:class:`Clifford` (of one class, with a diagonal symmetric bilinear form)
+        :param algebra: :py:class:`BladeAlgebra`, defaults to the :py:meth:`Clifford.blade_algebra` of the multivectors
+        :param dtype: dtype of the coefficients (object for symbolic coefficients)
+        :return: one dimensional array of the multivectors
+        """
+        multivectors = list(multivectors)
+        terms = [[(key if isinstance(key, tuple) else (key,), value) for key, value in m.items()] for m in multivectors]
+        if algebra is None:
+            algebra = type(multivectors[0]).blade_algebra({slot for keys in terms for key, _ in keys for slot in key})
+            if algebra is None:
+                raise NotImplementedError("multivector arrays need a symmetric bilinear form that is diagonal")
+        coefficients = _np.zeros((len(multivectors), 1 << algebra.dimension), dtype=dtype)
+        for index, keys in enumerate(terms):
+            coefficients[index] = algebra.to_dense(algebra.encoded(keys), dtype=dtype)
+        return cls(algebra, coefficients)
+
+    def to_multivectors(self, cls):
+        """
+        :param cls: :py:class:`Clifford` class of the multivectors
+        :return: list of multivectors, in the (C-)order of the flattened array
+        """
+        return [
+            cls(self.algebra.decoded(self.algebra.from_dense(dense)))
+            for dense in self.coefficients.reshape(-1, 1 << self.algebra.dimension)
+        ]
+
+    # endregion
+
+    # region algebraic operations
+
+    def _other(self, other):
+        if other.algebra is not self.algebra and other.algebra.basis != self.algebra.basis:
+            raise ValueError("multivector arrays of different algebras")
+        return other.coefficients
+
+    def __add__(self, other):
+        return type(self)(self.algebra, self.coefficients + self._other(other))
+
+    def __sub__(self, other):
+        return type(self)(self.algebra, self.coefficients - self._other(other))
+
+    def __neg__(self):
+        return type(self)(self.algebra, -self.coefficients)
+
+    def __rmul__(self, scalar):
+        """
+        :param scalar: scalar, or array of scalars broadcast over the multivectors
+        """
+        return type(self)(self.algebra, _np.asarray(scalar)[..., None] * self.coefficients)
+
+    def __mul__(self, other):
+        """
+        Element-wise geometric product (or scaling, see :py:meth:`__rmul__`)
+        """
+        if not isinstance(other, MultivectorArray):
+            return self.__rmul__(other)
+        table = self.algebra.dense_cayley_table()
+        masks = _np.arange(0, 1 << self.algebra.dimension)
+        lhs, rhs = _np.broadcast_arrays(self.coefficients, self._other(other))
+        product = _np.zeros(lhs.shape, dtype=_np.result_type(lhs, rhs, table))
+        for mask in masks.tolist():
+            factor = lhs[..., mask : mask + 1]
+            if not factor.any():
+                continue
+            product[..., mask ^ masks] += factor * rhs * table[mask]
+        return type(self)(self.algebra, product)
+
+    def _signed(self, signs):
+        return type(self)(self.algebra, self.coefficients * _np.asarray(signs))
+
+    def _grades(self):
+        return _np.array([_BladeAlgebra.grade(mask) for mask in range(0, 1 << self.algebra.dimension)])
+
+    def grade(self, k):
+        r"""
+        :return: grade projections :math:`\langle A\rangle_k`
+        """
+        return self._signed(self._grades() == k)
+
+    def reverse(self):
+        grades = self._grades()
+        return self._signed(_np.where((grades * (grades - 1) // 2) % 2 == 0, 1, -1))
+
+    def grade_involution(self):
+        return self._signed(_np.where(self._grades() % 2 == 0, 1, -1))
+
+    def conjugate(self):
+        grades = self._grades()
+        return self._signed(_np.where((grades * (grades + 1) // 2) % 2 == 0, 1, -1))
+
+    def scalar(self):
+        r"""
+        :return: array of the scalar parts :math:`\langle A\rangle_0`
+        """
+        return self.coefficients[..., 0]
+
+    def inverse_versor(self):
+        r"""
+        :return: :math:`V^{-1} = \widetilde{V}/(V\widetilde{V})` (only valid for versors)
+        """
+        reverse = self.reverse()
+        return (1 / (self * reverse).scalar()) * reverse
+
+    def _odd(self):
+        """
+        :return: boolean array, true where the multivector has an odd part (i.e. is an odd versor)
+        """
+        return (self.coefficients[..., self._grades() % 2 == 1] != 0).any(axis=-1)
+
+    def apply_versor(self, versor):
+        r"""
+        Versor action :math:`A\mapsto V\widehat{A}V^{-1}` for odd and :math:`A\mapsto VAV^{-1}` for even versors
+        :math:`V`, i.e. the sandwich product with the sign :math:`(-1)^{kl}` on the grade :math:`k` part of :math:`A`
+        for a versor of parity :math:`l`. On vectors this is the twisted sandwich product :math:`\widehat{V}vV^{-1}`,
+        so an odd versor acts as the same reflection on every grade.
+
+        A single versor (of shape ()) is first turned into a :math:`2^n\times 2^n` matrix that is applied to all
+        multivectors in one matrix multiplication.
+
+        :param versor: :py:class:`MultivectorArray` (broadcast against self) or :py:class:`Clifford`
+        """
+        if not isinstance(versor, MultivectorArray):
+            versor = type(self).from_multivectors([versor], self.algebra, dtype=self.coefficients.dtype)[0]
+        odd = versor._odd()
+        if versor.shape == ():
+            identity = type(self)(self.algebra, _np.eye(1 << self.algebra.dimension, dtype=versor.coefficients.dtype))
+            if odd:
+                identity = identity.grade_involution()
+            matrix = (versor * identity * versor.inverse_versor()).coefficients
+            return type(self)(self.algebra, self.coefficients @ matrix)
+        operand = type(self)(
+            self.algebra, _np.where(odd[..., None], self.grade_involution().coefficients, self.coefficients)
+        )
+        return versor * operand * versor.inverse_versor()
+
+    # endregion
@@ -1,22 +1,278 @@
+import collections as _collections
+import contextlib as _contextlib
 import functools as _functools
+import hashlib as _hashlib
 import itertools as _itertools
 import math as _math
 import operator as _operator
 import sys as _sys
+import threading as _threading
+import weakref as _weakref
+from concurrent import futures as _futures
+
+import numpy as _np
+
+_fused_operators = {
+    _operator.abs: "abs({0})",
+    _operator.__neg__: "-{0}",
+    _operator.__pos__: "+{0}",
+    _operator.__lt__: "{0} < {1}",
+    _operator.__le__: "{0} <= {1}",
+    _operator.__eq__: "{0} == {1}",
+    _operator.__ne__: "{0} != {1}",
+    _operator.__ge__: "{0} >= {1}",
+    _operator.__gt__: "{0} > {1}",
+    _operator.__add__: "{0} + {1}",
+    _operator.__and__: "{0} & {1}",
+    _operator.__floordiv__: "{0} // {1}",
+    _operator.__mod__: "{0} % {1}",
+    _operator.__mul__: "{0} * {1}",
+    _operator.__or__: "{0} | {1}",
+    _operator.__pow__: "{0} ** {1}",
+    _operator.__sub__: "{0} - {1}",
+    _operator.__truediv__: "{0} / {1}",
+}
+
+_evaluation = _threading.local()
+
+
+def _zero_signs(value):
+    """
+	:return: signs of the (real and imaginary) parts of floats and complex numbers, which tell 0.0 from -0.0
+	"""
+    if isinstance(value, float):
+        return (_math.copysign(1, value),)
+    if isinstance(value, complex):
+        return _math.copysign(1, value.real), _math.copysign(1, value.imag)
+    return ()
+
+
+def _memo_key(value):
+    """
+	:return: hashable key of a value (arrays are digested, floats also keyed by the sign of zero),
+		raises TypeError for other unhashable values
+	"""
+    if isinstance(value, _np.ndarray):
+        digest = _hashlib.blake2b(_np.ascontiguousarray(value).tobytes(), digest_size=16).digest()
+        return _np.ndarray, value.dtype.str, value.shape, digest
+    if isinstance(value, (tuple, list)):
+        return type(value), tuple(_memo_key(item) for item in value)
+    hash(value)
+    return (type(value), value) + _zero_signs(value)
+
+
+def _identity(operand):
+    """
+	:return: nodes, functions and mutable (unhashable) constants by identity, hashable constants by value
+		(floats also by the sign of zero, also inside tuples and frozensets)
+	"""
+    if callable(operand):
+        return id(operand)
+    try:
+        hash(operand)
+    except TypeError:
+        return id(operand)
+    if isinstance(operand, (tuple, frozenset)):
+        return type(operand), type(operand)(_identity(item) for item in operand)
+    return (type(operand), operand) + _zero_signs(operand)
+
+
+# nodes by (class, operator, operand identities); an entry lives as long as its node, which keeps its operands alive
+_nodes = _weakref.WeakValueDictionary()
+
+
+class _Memoized:
+    def __init__(self, node, maxsize, scoped):
+        self.node = node
+        self.maxsize = maxsize
+        self.scoped = scoped
+        # unscoped values, shared by all evaluations (and threads)
+        self.cache = _collections.OrderedDict()
+        self.lock = _threading.Lock()
+
+    def __repr__(self):
+        return "memoized({0})".format(self.node)
+
+    def _cache(self):
+        if self.scoped:
+            # the caches of an evaluation belong to the (thread local) evaluation, see Pointwise.__call__
+            caches = getattr(_evaluation, "caches", None)
+            if caches is None:
+                return None, None
+            return caches.setdefault(id(self), _collections.OrderedDict()), _contextlib.nullcontext()
+        return self.cache, self.lock
+
+    def __call__(self, *args, **kwargs):
+        try:
+            key = _memo_key(args), _memo_key(sorted(kwargs.items()))
+        except TypeError:
+            return self.node(*args, **kwargs)
+        cache, lock = self._cache()
+        if cache is None:
+            return self.node(*args, **kwargs)
+        with lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        value = self.node(*args, **kwargs)
+        with lock:
+            cache[key] = value
+            if len(cache) > self.maxsize:
+                cache.popitem(last=False)
+        return value
 
 
 class Pointwise:
-    def __init__(self, function):
+    def __init__(self, function, operator=None, operands=()):
+        """
+		:param function: function evaluated at a point (or a constant)
+		:param operator: operator this node applies to its operands, None for leaves
+		:param operands: operands of the operator (nodes, functions or constants)
+		"""
         self.function = function
+        self.operator = operator
+        self.operands = operands
+
+    @classmethod
+    def _interned(cls, operator, operands):
+        """
+		:return: the existing node for the operator and operands (see :py:meth:`_node`), None if there is none
+		"""
+        return _nodes.get((cls, operator, tuple(_identity(operand) for operand in operands)))
+
+    @classmethod
+    def _node(cls, function, operator, operands):
+        """
+		Hash-consing: building the same operator on the same operands (nodes and functions by identity, constants
+		by value) again returns the same node, so identical subexpressions built separately are shared (and
+		evaluated once by :py:meth:`compile` and by memoized nodes).
+		"""
+        key = cls, operator, tuple(_identity(operand) for operand in operands)
+        node = _nodes.get(key)
+        if node is None:
+            node = cls(function, operator, operands)
+            _nodes[key] = node
+        return node
 
     def __repr__(self):
         return repr(self.function) + "-pointwise"
 
     def __call__(self, *args, **kwargs):
-        if callable(self.function):
-            return self.function(*args, **kwargs)
-        else:
+        if not callable(self.function):
             return self.function
+        if getattr(_evaluation, "caches", None) is not None:
+            return self.function(*args, **kwargs)
+        # top-level call: the caches of memoized nodes with per-evaluation scope live until the end of this call
+        _evaluation.caches = dict()
+        try:
+            return self.function(*args, **kwargs)
+        finally:
+            _evaluation.caches = None
+
+    def memoize(self, maxsize=128, scoped=True):
+        """
+		Node that caches the values of this node by the arguments (arrays are keyed by a digest of their contents,
+		calls with other unhashable arguments are not cached), so that a subexpression shared by several parts of
+		an expression is evaluated once per point.
+
+		NOTE: cached values are returned as is, they must not be modified
+
+		:param maxsize: maximal number of cached values, the least recently used value is evicted first
+		:param scoped: clear the cache at the end of each top-level evaluation (the outermost call of a node),
+			otherwise the values are kept across evaluations
+		"""
+        return type(self)._node(_Memoized(self, maxsize, scoped), Pointwise.memoize, (self, maxsize, scoped))
+
+    def compile(self):
+        """
+		Fuses the operation tree into a single function: the generated source evaluates each leaf once and then
+		applies the operators in one flat sequence of statements (one temporary per node), instead of one closure
+		call per node. Nodes that occur several times in the tree are evaluated once.
+		With leaves that accept arrays, the fused function evaluates all points of the arrays in one call.
+
+		NOTE: nodes with operators other than the arithmetic and comparison operators are evaluated as leaves
+
+		:return: function with the same signature as the node (the generated source is its ``source`` attribute)
+		"""
+        namespace = dict()
+        lines = list()
+        names = dict()
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in names:
+                continue
+            fused = isinstance(node, Pointwise) and node.operator in _fused_operators
+            if fused and not expanded:
+                stack.append((node, True))
+                stack.extend((operand, False) for operand in reversed(node.operands))
+                continue
+            name = "t{0}".format(len(names))
+            names[id(node)] = name
+            if fused:
+                expression = _fused_operators[node.operator].format(*(names[id(operand)] for operand in node.operands))
+            else:
+                namespace["leaf_" + name] = node
+                expression = ("leaf_{0}(*args, **kwargs)" if callable(node) else "leaf_{0}").format(name)
+            lines.append("    {0} = {1}".format(name, expression))
+        source = "def fused(*args, **kwargs):\n{0}\n    return {1}\n".format("\n".join(lines), names[id(self)])
+        exec(compile(source, "<fused {0}>".format(type(self).__name__), "exec"), namespace)
+        fused = namespace["fused"]
+        fused.source = source
+        return fused
+
+    @staticmethod
+    def _vectorised_values(function, points, first_value):
+        try:
+            values = _np.asarray(function(_np.moveaxis(points, 0, -1)))
+            if values.shape[-1:] != (len(points),):
+                return None
+            values = _np.moveaxis(values, -1, 0)
+            if not (values.shape[1:] == first_value.shape and _np.allclose(values[0], first_value, equal_nan=True)):
+                return None
+        except (TypeError, ValueError, IndexError):
+            # the leaves do not accept arrays of points (or return ragged values)
+            return None
+        return values
+
+    def map(self, points, chunk_size=None, processes=None):
+        """
+		Evaluates at many points. The points are first passed as arrays through the (compiled, see :py:meth:`compile`)
+		operation tree, i.e. the leaves are called with the coordinates along the first axis and the points along
+		the last axis, e.g. ``x, y, z = p`` gives arrays of coordinates. The result of each chunk is checked (its shape,
+		and its value at the first point of the chunk against a call at that point alone); from the first chunk where
+		the leaves are not vectorised (they raise, or the result does not match), the points are evaluated one at a
+		time, optionally in a process pool.
+
+		NOTE: the process pool pickles the node, so its functions must be picklable (e.g. module level functions)
+
+		:param points: array of shape (number of points, ...)
+		:param chunk_size: number of points evaluated at once, limits the memory used by the vectorised evaluation
+		:param processes: number of worker processes for points evaluated one at a time, None to evaluate them here
+		:return: array of shape (number of points, ...), of shape (0,) for no points (nothing is evaluated, so the
+			shape of the values is unknown)
+		"""
+        points = _np.asarray(points)
+        chunk_size = max(1, len(points) if chunk_size is None else chunk_size)
+        if len(points) == 0:
+            return _np.asarray([])
+        function = self.compile() if self.operator is not None else self
+        vectorised = True
+        chunks = list()
+        with _futures.ProcessPoolExecutor(processes) if processes else _contextlib.nullcontext() as executor:
+            for start in range(0, len(points), chunk_size):
+                chunk = points[start : start + chunk_size]
+                values = None
+                if vectorised:
+                    values = type(self)._vectorised_values(function, chunk, _np.asarray(self(chunk[0])))
+                    vectorised = values is not None
+                if values is None and executor is not None:
+                    chunksize = max(1, len(chunk) // (4 * processes))
+                    values = _np.asarray(list(executor.map(self, chunk, chunksize=chunksize)))
+                elif values is None:
+                    values = _np.asarray([self(point) for point in chunk])
+                chunks.append(values)
+        return _np.concatenate(chunks)
 
     @staticmethod
     def __op(lhs, op, *args, **kwargs):
@@ -30,32 +286,32 @@ class Pointwise:
         def __abs(*args, **kwargs):
             return type(self).__op(self, _operator.abs, *args, **kwargs)
 
-        return type(self)(__abs)
+        return type(self)._node(__abs, _operator.abs, (self,))
 
     def __neg__(self):
         def __neg(*args, **kwargs):
             return type(self).__op(self, _operator.__neg__, *args, **kwargs)
 
-        return type(self)(__neg)
+        return type(self)._node(__neg, _operator.__neg__, (self,))
 
     def __pos__(self):
         def __pos(*args, **kwargs):
             return type(self).__op(self, _operator.__pos__, *args, **kwargs)
 
-        return type(self)(__pos)
+        return type(self)._node(__pos, _operator.__pos__, (self,))
 
     def __rmul__(self, lhs):
         def __rmul(*args, **kwargs):
             return (lhs(*args, **kwargs) if callable(lhs) else lhs) * self(*args, **kwargs)
 
-        return type(self)(__rmul)
+        return type(self)._node(__rmul, _operator.__mul__, (lhs, self))
 
     def __lt__(self, rhs):
         # assert isinstance(rhs, Pointwise)
         def __lt(*args, **kwargs):
             return type(self).__binop(self, _operator.__lt__, rhs, *args, **kwargs)
 
-        return type(self)(__lt)
+        return type(self)._node(__lt, _operator.__lt__, (self, rhs))
 
     def __le__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -63,7 +319,7 @@ class Pointwise:
         def __le(*args, **kwargs):
             return type(self).__binop(self, _operator.__le__, rhs, *args, **kwargs)
 
-        return type(self)(__le)
+        return type(self)._node(__le, _operator.__le__, (self, rhs))
 
     def __eq__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -71,7 +327,7 @@ class Pointwise:
         def __eq(*args, **kwargs):
             return type(self).__binop(self, _operator.__eq__, rhs, *args, **kwargs)
 
-        return type(self)(__eq)
+        return type(self)._node(__eq, _operator.__eq__, (self, rhs))
 
     def __ne__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -79,7 +335,7 @@ class Pointwise:
         def __ne(*args, **kwargs):
             return type(self).__binop(self, _operator.__ne__, rhs, *args, **kwargs)
 
-        return type(self)(__ne)
+        return type(self)._node(__ne, _operator.__ne__, (self, rhs))
 
     def __ge__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -87,7 +343,7 @@ class Pointwise:
         def __ge(*args, **kwargs):
             return type(self).__binop(self, _operator.__ge__, rhs, *args, **kwargs)
 
-        return type(self)(__ge)
+        return type(self)._node(__ge, _operator.__ge__, (self, rhs))
 
     def __gt__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -95,7 +351,7 @@ class Pointwise:
         def __gt(*args, **kwargs):
             return type(self).__binop(self, _operator.__gt__, rhs, *args, **kwargs)
 
-        return type(self)(__gt)
+        return type(self)._node(__gt, _operator.__gt__, (self, rhs))
 
     def __add__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -103,7 +359,7 @@ class Pointwise:
         def __add(*args, **kwargs):
             return type(self).__binop(self, _operator.__add__, rhs, *args, **kwargs)
 
-        return type(self)(__add)
+        return type(self)._node(__add, _operator.__add__, (self, rhs))
 
     def __and__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -111,7 +367,7 @@ class Pointwise:
         def __and(*args, **kwargs):
             return type(self).__binop(self, _operator.__and__, rhs, *args, **kwargs)
 
-        return type(self)(__and)
+        return type(self)._node(__and, _operator.__and__, (self, rhs))
 
     def __floordiv__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -119,7 +375,7 @@ class Pointwise:
         def __floordiv(*args, **kwargs):
             return type(self).__binop(self, _operator.__floordiv__, rhs, *args, **kwargs)
 
-        return type(self)(__floordiv)
+        return type(self)._node(__floordiv, _operator.__floordiv__, (self, rhs))
 
     def __mod__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -127,7 +383,7 @@ class Pointwise:
         def __mod(*args, **kwargs):
             return type(self).__binop(self, _operator.__mod__, rhs, *args, **kwargs)
 
-        return type(self)(__mod)
+        return type(self)._node(__mod, _operator.__mod__, (self, rhs))
 
     def __mul__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -135,7 +391,7 @@ class Pointwise:
         def __mul(*args, **kwargs):
             return type(self).__binop(self, _operator.__mul__, rhs, *args, **kwargs)
 
-        return type(self)(__mul)
+        return type(self)._node(__mul, _operator.__mul__, (self, rhs))
 
     def __or__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -143,7 +399,7 @@ class Pointwise:
         def __or(*args, **kwargs):
             return type(self).__binop(self, _operator.__or__, rhs, *args, **kwargs)
 
-        return type(self)(__or)
+        return type(self)._node(__or, _operator.__or__, (self, rhs))
 
     def __pow__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -151,7 +407,7 @@ class Pointwise:
         def __pow(*args, **kwargs):
             return type(self).__binop(self, _operator.__pow__, rhs, *args, **kwargs)
 
-        return type(self)(__pow)
+        return type(self)._node(__pow, _operator.__pow__, (self, rhs))
 
     def __sub__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -159,7 +415,7 @@ class Pointwise:
         def __sub(*args, **kwargs):
             return type(self).__binop(self, _operator.__sub__, rhs, *args, **kwargs)
 
-        return type(self)(__sub)
+        return type(self)._node(__sub, _operator.__sub__, (self, rhs))
 
     def __truediv__(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -167,7 +423,7 @@ class Pointwise:
         def __truediv(*args, **kwargs):
             return type(self).__binop(self, _operator.__truediv__, rhs, *args, **kwargs)
 
-        return type(self)(__truediv)
+        return type(self)._node(__truediv, _operator.__truediv__, (self, rhs))
 
     def after(self, rhs):
         """
@@ -181,7 +437,7 @@ class Pointwise:
             except:
                 return self(*rhs(*args, **kwargs))
 
-        return type(self)(__after)
+        return type(self)._node(__after, Pointwise.after, (self, rhs))
 
     def before(self, rhs):
         """
@@ -195,4 +451,4 @@ class Pointwise:
             except:
                 return rhs(self(*args, **kwargs))
 
-        return type(self)(__before)
+        return type(self)._node(__before, Pointwise.before, (self, rhs))
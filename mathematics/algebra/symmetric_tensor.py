@@ -0,0 +1,293 @@
+r"""
+Tensors with slot symmetries, storing only canonical components
+"""
+
+__all__ = [
+    "SymmetricTensor",
+    "SlotSymmetry",
+    "BlockSymmetry",
+    "symmetric",
+    "antisymmetric",
+    "block_symmetric",
+    "riemann_symmetries",
+]
+import collections as _collections
+import numbers as _numbers
+
+from .tensor import Tensor as _Tensor
+
+
+def _slot_order(slot):
+    """Total order on slots: numbers by value, before anything else (ordered by repr)"""
+    if isinstance(slot, _numbers.Real) and not getattr(slot, "free_symbols", None):
+        return (0, slot, "")
+    return (1, 0, repr(slot))
+
+
+def _key_order(key):
+    return tuple(_slot_order(slot) for slot in key)
+
+
+class SlotSymmetry:
+    r"""
+    (Anti)symmetry under interchange of any two of the given slots.
+
+    .. math::
+        T(\ldots,u,\ldots,v,\ldots) = \mathrm{sign} \cdot T(\ldots,v,\ldots,u,\ldots)
+    """
+
+    def __init__(self, slot_indices=None, sign=1):
+        """
+        :param slot_indices: indices of the slots, defaults to all slots (of any order)
+        :param sign: 1 (symmetric) or -1 (antisymmetric)
+        """
+        self.slot_indices = None if slot_indices is None else tuple(slot_indices)
+        self.sign = sign
+
+    def __repr__(self):
+        return "{0}({1}, sign={2})".format(type(self).__name__, self.slot_indices, self.sign)
+
+    def indices(self, order):
+        return tuple(range(0, order)) if self.slot_indices is None else self.slot_indices
+
+    def generators(self, order):
+        """
+        :param order: order of the key
+        :return: generators of the symmetry group as (permutation, sign); ``key[permutation[i]]`` is moved to slot ``i``
+        """
+        indices = self.indices(order)
+        generators = list()
+        for first, second in zip(indices, indices[1:]):
+            permutation = list(range(0, order))
+            permutation[first], permutation[second] = second, first
+            generators.append((tuple(permutation), self.sign))
+        return generators
+
+    def sorted_key(self, key):
+        """
+        Sorts the slots with sign tracking (insertion sort).
+
+        :return: (sorted key, sign) where :math:`T(key) = sign \\cdot T(sorted key)`; sign is 0 if the component vanishes
+        """
+        indices = self.indices(len(key))
+        slots = [key[index] for index in indices]
+        sign = 1
+        for i in range(1, len(slots)):
+            j = i
+            while j > 0 and _slot_order(slots[j - 1]) > _slot_order(slots[j]):
+                slots[j - 1], slots[j] = slots[j], slots[j - 1]
+                sign = sign * self.sign
+                j -= 1
+        if self.sign == -1 and any(slots[i] == slots[i + 1] for i in range(0, len(slots) - 1)):
+            sign = 0
+        result = list(key)
+        for index, slot in zip(indices, slots):
+            result[index] = slot
+        return tuple(result), sign
+
+
+class BlockSymmetry:
+    r"""
+    (Anti)symmetry under interchange of equally sized blocks of slots, e.g. the pair symmetry of the Riemann tensor
+
+    .. math::
+        R(a,b,c,d) = R(c,d,a,b)
+    """
+
+    def __init__(self, *blocks, sign=1):
+        self.blocks = tuple(tuple(block) for block in blocks)
+        self.sign = sign
+
+    def __repr__(self):
+        return "{0}({1}, sign={2})".format(type(self).__name__, self.blocks, self.sign)
+
+    def generators(self, order):
+        generators = list()
+        for first, second in zip(self.blocks, self.blocks[1:]):
+            permutation = list(range(0, order))
+            for first_index, second_index in zip(first, second):
+                permutation[first_index], permutation[second_index] = second_index, first_index
+            generators.append((tuple(permutation), self.sign))
+        return generators
+
+
+def symmetric(*slot_indices):
+    """Symmetry in the given slots (all slots if none are given)"""
+    return SlotSymmetry(slot_indices if slot_indices else None, 1)
+
+
+def antisymmetric(*slot_indices):
+    """Antisymmetry in the given slots (all slots if none are given)"""
+    return SlotSymmetry(slot_indices if slot_indices else None, -1)
+
+
+def block_symmetric(*blocks):
+    return BlockSymmetry(*blocks, sign=1)
+
+
+def riemann_symmetries():
+    r"""
+    .. math::
+        R(a,b,c,d) = -R(b,a,c,d) = -R(a,b,d,c) = R(c,d,a,b)
+
+    NOTE: the first Bianchi identity is a linear relation between components, not a slot symmetry, so it is not used.
+    """
+    return (antisymmetric(0, 1), antisymmetric(2, 3), block_symmetric((0, 1), (2, 3)))
+
+
+class SymmetricTensor(_Tensor):
+    r"""
+    Tensor with slot symmetries that stores one canonical component per orbit of the symmetry group.
+
+    Components can be assigned and looked up by any key, they are mapped to the canonical key (with sign).
+    Assignment has dict semantics: assigning a component assigns its whole orbit, so of several (possibly
+    conflicting) assignments to keys of one orbit, e.g. ``T[(0, 1)] = 1`` and ``T[(1, 0)] = 2`` for a symmetric
+    tensor, the last one wins without a warning.
+    Components that vanish because of the symmetries (e.g. repeated slots of an antisymmetric tensor) are not stored.
+
+    NOTE: ``slot_symmetries`` is set on subclasses, see :py:func:`mathematics.algebra.create.create_symmetric_tensor`.
+
+    NOTE: products and traces are computed on :py:meth:`expanded` and are ordinary :py:class:`Tensor`.
+    """
+
+    slot_symmetries = ()
+    canonical_key_cache_size = 2 ** 16
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    # region canonical keys
+
+    @classmethod
+    def canonical_keys(cls):
+        """
+        Canonical keys computed so far by :py:meth:`canonical_key`, in least recently used order.
+        Each class has its own cache (which is collected with the class), holding at most ``canonical_key_cache_size``
+        keys.
+
+        :return: dict from key to (canonical key, sign)
+        """
+        if "_canonical_keys" not in cls.__dict__:
+            cls._canonical_keys = _collections.OrderedDict()
+        return cls._canonical_keys
+
+    @classmethod
+    def canonical_key(cls, key):
+        """
+        :param key: key (tuple of slots)
+        :return: (canonical key, sign) where :math:`T(key) = sign \\cdot T(canonical key)`,
+            sign is 0 if the component vanishes
+        """
+        cache = cls.canonical_keys()
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        merged = _Tensor._merge_keys(key)
+        if len(cls.slot_symmetries) == 1 and isinstance(cls.slot_symmetries[0], SlotSymmetry):
+            result = cls.slot_symmetries[0].sorted_key(merged)
+        else:
+            orbit, vanishes = cls._orbit(merged)
+            canonical = min(orbit, key=_key_order)
+            result = canonical, 0 if vanishes else orbit[canonical]
+        cache[key] = result
+        while len(cache) > cls.canonical_key_cache_size:
+            cache.popitem(last=False)
+        return result
+
+    @classmethod
+    def _orbit(cls, key):
+        """
+        :return: (orbit as key to sign relative to ``key``, whether the component vanishes)
+        """
+        generators = [generator for symmetry in cls.slot_symmetries for generator in symmetry.generators(len(key))]
+        orbit = {key: 1}
+        frontier = [key]
+        vanishes = False
+        while frontier:
+            current = frontier.pop()
+            for permutation, sign in generators:
+                image = tuple(current[index] for index in permutation)
+                image_sign = orbit[current] * sign
+                if image in orbit:
+                    vanishes = vanishes or orbit[image] != image_sign
+                else:
+                    orbit[image] = image_sign
+                    frontier.append(image)
+        return orbit, vanishes
+
+    # endregion
+
+    # region dict interface
+
+    def __setitem__(self, key, value):
+        canonical, sign = type(self).canonical_key(key)
+        if sign:
+            super().__setitem__(canonical, value if sign == 1 else -value)
+
+    def __getitem__(self, key):
+        canonical, sign = type(self).canonical_key(key)
+        if not sign:
+            return 0
+        value = super().__getitem__(canonical)
+        return value if sign == 1 else -value
+
+    def __delitem__(self, key):
+        super().__delitem__(type(self).canonical_key(key)[0])
+
+    def __contains__(self, key):
+        return super().__contains__(type(self).canonical_key(key)[0])
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def pop(self, key, *default):
+        canonical, sign = type(self).canonical_key(key)
+        if sign and super().__contains__(canonical):
+            value = super().pop(canonical)
+            return value if sign == 1 else -value
+        if default:
+            return default[0]
+        if not sign:
+            return 0
+        raise KeyError(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    # endregion
+
+    def expanded(self):
+        """
+        :return: all (nonzero) components
+        :rtype: :py:class:`Tensor`
+        """
+        expansion = _Tensor()
+        for key, value in self.items():
+            for image, sign in type(self)._orbit(key)[0].items():
+                expansion[image] = value if sign == 1 else -value
+        return expansion
+
+    # region algebraic operations
+
+    def __add__(self, B):
+        if type(B) is type(self):
+            return super().__add__(B)
+        return self.expanded() + B
+
+    def outer_product(self, B):
+        return self.expanded().outer_product(B)
+
+    def trace(self, first_slot_index, second_slot_index, pairing=None):
+        return self.expanded().trace(first_slot_index, second_slot_index, pairing)
+
+    def braiding_map(self, slot_permutation):
+        raise NotImplementedError("braiding does not preserve the slot symmetries, braid the expanded tensor instead")
+
+    # endregion
@@ -2,16 +2,115 @@
 Tensor algebra
 """
 
-__all__ = ["Tensor"]
+__all__ = ["Tensor", "PruningPolicy"]
 import copy as _copy
+import numbers as _numbers
 from collections.abc import Iterable as _Iterable
 
+import numpy as _np
 from pylatexenc.latex2text import LatexNodes2Text as _LatexNodes2Text
 
 from .dual import Dual as _Dual
 
 
+class PruningPolicy:
+    r"""Policy for dropping zero or near-zero coefficients during tensor arithmetic.
+
+	A numeric coefficient :math:`c` is negligible if :math:`|c| \leq \max(\mathrm{atol}, \mathrm{rtol}\cdot\max_k |c_k|)`,
+	where :math:`c_k` are the numeric coefficients of the same tensor.
+	Other coefficients (e.g. sympy expressions) are negligible only if they equal zero.
+
+	NOTE: counts the number of pruned terms in ``nof_pruned``
+	"""
+
+    def __init__(self, absolute_tolerance=0, relative_tolerance=0):
+        self.absolute_tolerance = absolute_tolerance
+        self.relative_tolerance = relative_tolerance
+        self.nof_pruned = 0
+
+    def __repr__(self):
+        return "{0}(absolute_tolerance={1}, relative_tolerance={2})".format(
+            type(self).__name__, self.absolute_tolerance, self.relative_tolerance
+        )
+
+    @staticmethod
+    def _is_numeric(value):
+        return isinstance(value, _numbers.Number) and not hasattr(value, "free_symbols")
+
+    def negligible_keys(self, tensor):
+        """
+		:param tensor: tensor
+		:return: keys of the negligible coefficients
+		:rtype: list
+		"""
+        magnitudes = [abs(value) for value in tensor.values() if PruningPolicy._is_numeric(value)]
+        tolerance = max(self.absolute_tolerance, self.relative_tolerance * max(magnitudes) if magnitudes else 0)
+        negligible = list()
+        for key, value in tensor.items():
+            if PruningPolicy._is_numeric(value):
+                if abs(value) <= tolerance:
+                    negligible.append(key)
+            else:
+                try:
+                    if value == 0:
+                        negligible.append(key)
+                except (TypeError, ValueError):
+                    pass
+        return negligible
+
+    def prune(self, tensor):
+        """
+		NOTE: mutates tensor and returns tensor (to allow chains)
+
+		:param tensor: tensor
+		:return: tensor without negligible coefficients
+		"""
+        negligible = self.negligible_keys(tensor)
+        for key in negligible:
+            del tensor[key]
+        self.nof_pruned += len(negligible)
+        return tensor
+
+
 class Tensor(dict):
+    r"""
+	Tensor as a sum of pure tensors: maps tuples of slots (tensor base vectors) to coefficients.
+
+	NOTE: ``pruning_policy`` (see :py:class:`PruningPolicy`) can be set on the class (globally) or on an instance,
+	an instance policy is handed over to the results of the arithmetic operations on that instance.
+	"""
+
+    pruning_policy = None
+
+    def _pruned(self, result):
+        """applies the pruning policy of self to result
+
+		NOTE: mutates result and returns result (to allow chains)
+		"""
+        if "pruning_policy" in self.__dict__:
+            result.pruning_policy = self.pruning_policy
+        if self.pruning_policy is not None:
+            self.pruning_policy.prune(result)
+        return result
+
+    def prune(self, policy=None):
+        """
+		NOTE: mutates self and returns self (to allow chains)
+
+		:param policy: defaults to the pruning policy of self, or exact zeros if there is none
+		:type policy: PruningPolicy, optional
+		:return: self without negligible coefficients
+		"""
+        policy = self.pruning_policy if policy is None else policy
+        return (PruningPolicy() if policy is None else policy).prune(self)
+
+    def expanded(self):
+        """
+		:return: tensor where every (nonzero) component is stored, which for :py:class:`Tensor` is self
+		:rtype: [tensor]
+		"""
+        return self
+
     @staticmethod
     def _merge_keys(*keys):
         r"""Tensor product for pure tensors without coefficients.
@@ -58,7 +157,7 @@ class Tensor(dict):
 		:rtype: [tensor]
 		"""
 
-        return type(self)({key: scalar * self[key] for key in self.keys()})
+        return self._pruned(type(self)({key: scalar * self[key] for key in self.keys()}))
 
     def __add__(self, B):
         r"""tensor addition
@@ -89,23 +188,102 @@ class Tensor(dict):
 		"""
 
         A = _copy.deepcopy(self)
+        B = B if type(B) is type(self) else B.expanded()
         for B_key in B.keys():
             if B_key in self.keys():
                 A[B_key] = self[B_key] + B[B_key]
             else:
                 A[B_key] = B[B_key]
-        return A
+        return self._pruned(A)
 
     def __neg__(self):
-        return type(self)({key: -self[key] for key in self.keys()})
+        return self._pruned(type(self)({key: -self[key] for key in self.keys()}))
 
     def __sub__(self, B):
         return self.__add__(-B)
 
+    @staticmethod
+    def _normalized_keys(tensor):
+        r"""Keys of a tensor as tuples of slots, i.e. as they come out of :meth:`_merge_keys`.
+
+		:param tensor: tensor
+		:return: list of normalized keys (in iteration order) and whether they are all distinct
+		:rtype: tuple[list, bool]
+		"""
+        if all(type(key) is tuple for key in tensor.keys()):
+            return list(tensor.keys()), True
+        keys = [Tensor._merge_keys(key) for key in tensor.keys()]
+        return keys, len(set(keys)) == len(keys)
+
+    @staticmethod
+    def _coefficient_products(lhs_values, rhs_values):
+        r"""All products :math:`c_1^i \cdot c_2^j`, ordered with :math:`i` as the outer index.
+
+		NOTE: when both sides are plain python numbers of a single type the products are formed as one
+		outer product of arrays, otherwise (sympy expressions, mixed types, ...) pairwise in python.
+
+		:param lhs_values: coefficients :math:`c_1^i`
+		:param rhs_values: coefficients :math:`c_2^j`
+		:return: coefficient products
+		:rtype: list
+		"""
+        lhs_types = {type(value) for value in lhs_values}
+        rhs_types = {type(value) for value in rhs_values}
+        if len(lhs_types) == len(rhs_types) == 1 and lhs_types | rhs_types <= {int, float, complex}:
+            if int not in lhs_types | rhs_types or (
+                max(abs(value) for value in lhs_values) * max(abs(value) for value in rhs_values) < 2 ** 63
+            ):
+                return _np.multiply.outer(_np.asarray(lhs_values), _np.asarray(rhs_values)).ravel().tolist()
+        return [lhs_value * rhs_value for lhs_value in lhs_values for rhs_value in rhs_values]
+
+    def outer_product(self, B):
+        r"""Tensor product of tensors, formed in bulk.
+
+		All merged keys and all coefficient products are built in one pass each.
+		When the keys on each side are distinct and of a single order the merged keys are distinct as well,
+		so the result is built directly; otherwise coinciding merged keys are summed.
+
+		:param self: tensor
+		:type self: [tensor]
+		:param B: tensor (or scalar, which is then distributed into the coefficients)
+		:type B: [tensor]
+		:return: :math:`\mathsf{self} \otimes \mathsf{B}`
+		:rtype: [tensor]
+		"""
+        keys, distinct = Tensor._normalized_keys(self)
+        values = list(self.values())
+        if isinstance(B, type(self)):
+            B = B.expanded()
+            B_keys, B_distinct = Tensor._normalized_keys(B)
+            merged_keys = [key + B_key for key in keys for B_key in B_keys]
+            products = Tensor._coefficient_products(values, list(B.values()))
+            distinct = (
+                distinct
+                and B_distinct
+                and len({len(key) for key in keys}) <= 1
+                and len({len(B_key) for B_key in B_keys}) <= 1
+            )
+        else:
+            merged_keys = keys
+            products = [value * B for value in values]
+        if distinct:
+            return self._pruned(type(self)(zip(merged_keys, products)))
+        tensor_product = type(self)()
+        for merged_key, product in zip(merged_keys, products):
+            if merged_key in tensor_product:
+                # perhaps this could happen if one of the tensor base vectors are of mixed order?
+                # GUESS: summation best way to handle this?
+                tensor_product[merged_key] = tensor_product[merged_key] + product
+            else:
+                tensor_product[merged_key] = product
+        return self._pruned(tensor_product)
+
     def __mul__(self, B):
         r"""Tensor product of tensors.
 		(GUESS) This whole function is guesswork. I think the proper term is unbiased monodial category?
 
+		NOTE: see :meth:`outer_product`
+
 		:param self: tensor
 		:type self: [tensor]
 		:param B: tensor
@@ -113,33 +291,7 @@ class Tensor(dict):
 		:return: :math:`\mathsf{self} \otimes \mathsf{B} = (\sum_i c_1^i \mathsf{e_1}_i)\otimes(\sum_i c_2^i \mathsf{e_2}_i) = \sum_i \sum_j (c_1^i\cdot c_2^j)\cdot(\mathsf{e_1}_i \otimes \mathsf{e_2}_j)`
 		:rtype: [tensor]
 		"""
-        tensor_product = type(self)()
-        for self_key, self_value in self.items():
-            if isinstance(B, type(self)):
-                for B_key, B_value in B.items():
-                    # if (
-                    # 	 isinstance(self_key, _Iterable)
-                    # 	 and isinstance(B_key, _Iterable)
-                    # 	 and any(
-                    # 		 isinstance(lslot, type(self).Counit)
-                    # 		 and rslot == 1
-                    # 		 or isinstance(rslot, type(self).Counit)
-                    # 		 and lslot == 1
-                    # 		 for lslot, rslot in zip(self_key, B_key)
-                    # 	 )
-                    # ):
-                    # 	 continue
-                    # else:
-                    merged_key = type(self)._merge_keys(self_key, B_key)
-                    if merged_key not in tensor_product.keys():
-                        tensor_product[merged_key] = self_value * B_value
-                    else:
-                        # perhaps this could happen if one of the tensor base vectors are of mixed order?
-                        # GUESS: summation best way to handle this?
-                        tensor_product = tensor_product + type(self)({merged_key: self_value * B_value})
-            else:
-                tensor_product = tensor_product + type(self)({type(self)._merge_keys(self_key): self_value * B})
-        return tensor_product
+        return self.outer_product(B)
 
     # def coproduct(self):
     # 	 coprod = type(self)()
@@ -238,9 +390,12 @@ class Tensor(dict):
             for braided_key in braided_tensor.keys():
                 braided_value = braided_tensor[braided_key]
                 pairing_factor = pairing(*braided_key[0:2])
-                contracted_summand = type(self)({braided_key[2:]: braided_value * pairing_factor})
-                contraction = contraction + contracted_summand
-        return contraction
+                contracted_key = braided_key[2:]
+                if contracted_key in contraction:
+                    contraction[contracted_key] = contraction[contracted_key] + braided_value * pairing_factor
+                else:
+                    contraction[contracted_key] = braided_value * pairing_factor
+        return self._pruned(contraction)
 
     # endregion
 
@@ -267,6 +422,16 @@ class Tensor(dict):
             result = result.trace(order_self - r - 1, order_self - r)
         return result
 
+    def lazy(self):
+        """Deferred evaluation of expressions involving this tensor.
+
+		:return: leaf of an expression DAG, see :py:class:`mathematics.algebra.lazy_tensor.LazyTensor`
+		:rtype: [LazyTensor]
+		"""
+        from .lazy_tensor import LazyTensor
+
+        return LazyTensor.leaf(self)
+
     # region simplification
 
     def without_zeros(self, zero_coefficient=0):
@@ -279,10 +444,9 @@ class Tensor(dict):
 		:rtype: [type]
 		"""
 
-        result = type(self)({key: value for key, value in self.items() if value != zero_coefficient})
-        self.clear()
-        self.update(result)
-        return result
+        for key in [key for key, value in self.items() if value == zero_coefficient]:
+            del self[key]
+        return self
 
     # endregion
 
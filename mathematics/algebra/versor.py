@@ -0,0 +1,129 @@
+r"""
+Versors (products of invertible vectors) of a :py:class:`mathematics.algebra.clifford.Clifford` algebra,
+applied to vectors as the (twisted) sandwich product :math:`v \mapsto \widehat{V} v V^{-1}`
+"""
+
+__all__ = ["versor_inverse", "versor_matrix", "apply_versor", "rotor_exp", "rotor_log"]
+import math as _math
+
+import numpy as _np
+import sympy as _sympy
+
+
+def _is_symbolic(value):
+    return isinstance(value, _sympy.Basic) and not value.is_number
+
+
+def versor_inverse(versor):
+    r"""
+    .. math::
+        V^{-1} = \frac{\widetilde{V}}{V\widetilde{V}}
+
+    :param versor: versor (multivector)
+    :return: inverse of the versor
+    """
+    reverse = versor.reverse()
+    norm = (versor * reverse).get((), 0)
+    return reverse if norm == 1 else reverse * (1 / norm)
+
+
+def versor_matrix(versor, basis):
+    r"""
+    Matrix of the linear map :math:`v \mapsto \widehat{V} v V^{-1}` on vectors, where the grade involution
+    :math:`\widehat{V}=\pm V` makes odd versors act as reflections (rotors act as :math:`v \mapsto R v \widetilde{R}`).
+    Column :math:`j` holds the coefficients of :math:`\widehat{V}\mathbf{e}_j V^{-1}`.
+
+    :param versor: versor (multivector)
+    :param basis: basis vectors (slots)
+    :return: :math:`n\times n` array (of dtype object if the coefficients are symbolic)
+    """
+    cls = type(versor)
+    involution = versor.grade_involution()
+    inverse = versor_inverse(versor)
+    columns = list()
+    for slot in basis:
+        image = involution * cls({(slot,): 1}) * inverse
+        columns.append([image.get((other,), 0) for other in basis])
+    return _np.array(columns).T
+
+
+def apply_versor(versor, vectors, basis=None):
+    r"""
+    Sandwich product :math:`v \mapsto \widehat{V} v V^{-1}` of many vectors at once: the versor is converted to
+    a matrix once (see :py:func:`versor_matrix`), which is then applied to all vectors in one matrix multiplication.
+
+    :param versor: versor (multivector), or its matrix from :py:func:`versor_matrix`
+    :param vectors: array of shape (..., n) with the coefficients of the vectors in the basis
+    :param basis: basis vectors (slots), not needed if the versor is given as a matrix
+    :return: array of shape (..., n) with the coefficients of the transformed vectors
+    """
+    matrix = versor if isinstance(versor, _np.ndarray) else versor_matrix(versor, basis)
+    return _np.asarray(vectors) @ matrix.T
+
+
+def rotor_exp(bivector, nof_terms=24):
+    r"""
+    Exponential of a bivector. For simple bivectors, :math:`B^2` is a scalar and
+
+    .. math::
+        e^{B} = \begin{cases}
+            \cos\theta + \frac{B}{\theta}\sin\theta & B^2=-\theta^2<0
+        \\  \cosh\theta + \frac{B}{\theta}\sinh\theta & B^2=\theta^2>0
+        \\  1 + B & B^2=0
+        \end{cases}
+
+    Other bivectors are exponentiated with a truncated power series.
+
+    NOTE: the rotor :math:`e^{-B\theta/2}` rotates by the angle :math:`\theta` in the plane of the unit bivector
+    :math:`B`, e.g. from :math:`\mathbf{e}_1` towards :math:`\mathbf{e}_2` for :math:`B=\mathbf{e}_1\mathbf{e}_2`.
+
+    :param bivector: bivector (multivector)
+    :param nof_terms: number of terms of the power series
+    :return: rotor
+    """
+    cls = type(bivector)
+    one = cls({(): 1})
+    square = bivector * bivector
+    if any(key != () for key in square.keys()):
+        result = one
+        term = one
+        for k in range(1, nof_terms):
+            term = term * bivector * (1 / k)
+            result = result + term
+        return result
+    value = square.get((), 0)
+    if _is_symbolic(value):
+        angle = _sympy.sqrt(-value)
+        return _sympy.cos(angle) * one + bivector * (_sympy.sin(angle) / angle)
+    if value < 0:
+        angle = _math.sqrt(-value)
+        return _math.cos(angle) * one + bivector * (_math.sin(angle) / angle)
+    if value > 0:
+        angle = _math.sqrt(value)
+        return _math.cosh(angle) * one + bivector * (_math.sinh(angle) / angle)
+    return one + bivector
+
+
+def rotor_log(rotor):
+    r"""
+    Logarithm of a rotor :math:`R=\langle R\rangle_0+\langle R\rangle_2` with a simple bivector part,
+    the inverse of :py:func:`rotor_exp`.
+
+    :param rotor: rotor (multivector over an orthogonal basis)
+    :return: bivector
+    """
+    scalar = rotor.get((), 0)
+    bivector = rotor.grade(2)
+    if not bivector:
+        return bivector
+    value = (bivector * bivector).get((), 0)
+    if _is_symbolic(value) or _is_symbolic(scalar):
+        norm = _sympy.sqrt(-value)
+        return bivector * (_sympy.atan2(norm, scalar) / norm)
+    if value < 0:
+        norm = _math.sqrt(-value)
+        return bivector * (_math.atan2(norm, scalar) / norm)
+    if value > 0:
+        norm = _math.sqrt(value)
+        return bivector * (_math.atanh(norm / scalar) / norm)
+    return bivector * (1 / scalar)
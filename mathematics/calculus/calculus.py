@@ -4,21 +4,31 @@ calculus.py
 
 import functools as _functools
 import itertools as _itertools
+import math as _math
 
 import numpy as _np
 
+from ..finite_difference.grid import gradient as _gradient
 
-def projected_metric(metric_tensor):
+
+def projected_metric(metric_tensor, *, lapse_and_shift=False):
     r"""
-	:param metric_tensor: :math:`\gamma(e_i,e_j)=g(e_i,e_j)-\frac{g(e_0,e_i)g(e_0,e_j)}{g(e_0,e_0}`
-		:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`
+	:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`, of shape (..., n, n), optionally with leading batch axes
+	:param lapse_and_shift: also return the lapse :math:`N` and the shift :math:`\beta^i` of the 3+1 (ADM)
+		decomposition :math:`g_{00}=-N^2+\beta_i\beta^i`, :math:`g_{0i}=\beta_i=g_{ij}\beta^j` (:math:`i,j\geq 1`)
+	:return: :math:`\gamma(e_i,e_j)=g(e_i,e_j)-\frac{g(e_0,e_i)g(e_0,e_j)}{g(e_0,e_0)}`, :math:`i,j\geq 1`,
+		of shape (..., n - 1, n - 1) (and the lapse of shape (...) and the shift of shape (..., n - 1))
 	"""
-    return _np.array(
-        [
-            metric_tensor[(i, j)] - metric_tensor[(0, i)] * metric_tensor[(0, j)] / metric_tensor[(0, 0)]
-            for (i, j) in _itertools.product(range(1, 4), repeat=2)
-        ]
-    ).reshape((3, 3), order="C")
+    metric_tensor = _np.asarray(metric_tensor)
+    time_time = metric_tensor[..., 0, 0]
+    time_space = metric_tensor[..., 0, 1:]
+    space_space = metric_tensor[..., 1:, 1:]
+    projected = space_space - time_space[..., :, None] * time_space[..., None, :] / time_time[..., None, None]
+    if not lapse_and_shift:
+        return projected
+    shift = _np.linalg.solve(space_space, time_space[..., None])[..., 0]
+    lapse = _np.sqrt(_np.einsum("...i,...i->...", time_space, shift) - time_time)
+    return projected, lapse, shift
 
 
 def permutation_symbol(*indices):
@@ -28,94 +38,295 @@ def permutation_symbol(*indices):
     )
 
 
-def musical_isomorphism_flat(metric_tensor, tensor, nof_indices_lowered=None):
+def _contracted_with_metric(metric_tensor, tensor, nof_indices_contracted, nof_batch_axes):
+    r"""
+	Contracts each of the first ``nof_indices_contracted`` indices of the tensor with the first index of the metric,
+	one einsum per index:
+
+	.. math::
+		T_{\ldots j \ldots} = \sum_i g_{ij} T_{\ldots i \ldots}
+	"""
+    tensor = _np.asarray(tensor)
+    metric_tensor = _np.asarray(metric_tensor)
+    nof_batch_axes = metric_tensor.ndim - 2 if nof_batch_axes is None else nof_batch_axes
+    indices = "abcdefghijklmnopqrstuvwxy"[0 : tensor.ndim - nof_batch_axes]
+    nof_indices_contracted = len(indices) if nof_indices_contracted is None else nof_indices_contracted
+    for position in range(0, nof_indices_contracted):
+        contracted_indices = indices[0:position] + "z" + indices[position + 1 :]
+        tensor = _np.einsum(
+            "...{0},...{1}z->...{2}".format(indices, indices[position], contracted_indices), tensor, metric_tensor
+        )
+    return tensor
+
+
+def musical_isomorphism_flat(metric_tensor, tensor, nof_indices_lowered=None, *, nof_batch_axes=None):
     r"""Lower index (of component of contravariant tensor)
-		:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`
-		:param tensor: :math:`T(e^{i})e_i`
-		:param nof_indices_lowered:
+		:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`, optionally with leading batch (e.g. grid) axes
+		:param tensor: :math:`T(e^{i})e_i`, optionally with leading batch (e.g. grid) axes
+		:param nof_indices_lowered: the first ``nof_indices_lowered`` indices are lowered, defaults to all
+		:param nof_batch_axes: number of leading batch axes of the tensor, defaults to those of the metric
 		:return: ::math:`Xb(e_j)e^j`
 	"""
-    nof_dimensions = max(metric_tensor.shape)
-    nof_indices = len(tensor.shape)  # Number of tensored spaces / tensor degree
-    nof_indices_lowered = nof_indices if nof_indices_lowered is None else nof_indices_lowered
-    return _np.array(
-        [
-            sum(
-                [
-                    _functools.reduce(lambda x, y: x * y, [metric_tensor[(i, j)] for (i, j) in zip(I_i, I_j)],)
-                    * tensor[(I_i + I_rest)]
-                    for I_i in _itertools.product(range(0, nof_dimensions), repeat=nof_indices_lowered)
-                ]
-            )
-            for I_j in _itertools.product(range(0, nof_dimensions), repeat=nof_indices_lowered)
-            for I_rest in _itertools.product(range(0, nof_dimensions), repeat=nof_indices - nof_indices_lowered)
-        ]
-    ).reshape((nof_dimensions,) * nof_indices, order="C")
+    return _contracted_with_metric(metric_tensor, tensor, nof_indices_lowered, nof_batch_axes)
 
 
-def musical_isomorphism_sharp(metric_tensor, tensor, nof_indices_raised=None):
+def musical_isomorphism_sharp(
+    metric_tensor, tensor, nof_indices_raised=None, *, inverse_metric_tensor=None, nof_batch_axes=None
+):
     r"""Raise index (of component of covariant tensor)
-		:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`
-		:param tensor: :math:`T(e_i)e^i`
-		:param nof_indices_raised:
+		:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`, optionally with leading batch (e.g. grid) axes
+		:param tensor: :math:`T(e_i)e^i`, optionally with leading batch (e.g. grid) axes
+		:param nof_indices_raised: the first ``nof_indices_raised`` indices are raised, defaults to all
+		:param inverse_metric_tensor: :math:`g^{-1}`, if already known (otherwise it is computed from the metric)
+		:param nof_batch_axes: number of leading batch axes of the tensor, defaults to those of the metric
 		:return: :math:`T♯(e^j)e_j`
 	"""
-    nof_dimensions = max(metric_tensor.shape)
-    nof_indices = len(tensor.shape)  # Number of tensored spaces / tensor degree
-    nof_indices_raised = nof_indices if nof_indices_raised is None else nof_indices_raised
-    ginv = _np.linalg.inv(metric_tensor)
-    return _np.array(
-        [
-            sum(
-                [
-                    _functools.reduce(lambda x, y: x * y, [ginv[(i, j)] for (i, j) in zip(I_i, I_j)])
-                    * tensor[(I_i + I_rest)]
-                    for I_i in _itertools.product(range(0, nof_dimensions), repeat=nof_indices_raised)
-                ]
-            )
-            for I_j in _itertools.product(range(0, nof_dimensions), repeat=nof_indices_raised)
-            for I_rest in _itertools.product(range(0, nof_dimensions), repeat=nof_indices - nof_indices_raised)
-        ]
-    ).reshape((nof_dimensions,) * nof_indices, order="C")
+    if inverse_metric_tensor is None:
+        inverse_metric_tensor = _np.linalg.inv(metric_tensor)
+    if nof_batch_axes is None:
+        nof_batch_axes = _np.ndim(inverse_metric_tensor) - 2
+    return _contracted_with_metric(inverse_metric_tensor, tensor, nof_indices_raised, nof_batch_axes)
 
 
-def create_covariant_permutation_tensor(metric_tensor, nof_indices):
-    nof_dimensions = max(metric_tensor.shape)
+@_functools.lru_cache(maxsize=2 ** 4)
+def levi_civita_symbol(nof_dimensions, nof_indices=None):
+    r"""
+	:math:`\varepsilon_{i_1\ldots i_k}`, the sign of the permutation that sorts distinct indices (0 otherwise).
+	Only the nonzero entries are computed, from the (partial) permutations of the indices and their inversion counts.
+
+	NOTE: cached, the returned array is read only
+
+	:param nof_dimensions: dimension
+	:param nof_indices: number of indices, defaults to the dimension
+	:return: array of shape (nof_dimensions,) * nof_indices
+	"""
+    nof_indices = nof_dimensions if nof_indices is None else nof_indices
+    symbol = _np.zeros((nof_dimensions,) * nof_indices, dtype=int)
+    permutations = list(_itertools.permutations(range(0, nof_dimensions), nof_indices))
+    permutations = _np.array(permutations, dtype=int).reshape(len(permutations), nof_indices)
+    nof_inversions = sum(
+        (permutations[:, i] > permutations[:, j]).astype(int)
+        for i in range(0, nof_indices)
+        for j in range(i + 1, nof_indices)
+    )
+    symbol[tuple(permutations.T)] = _np.where(_np.asarray(nof_inversions) % 2 == 0, 1, -1)
+    symbol.setflags(write=False)
+    return symbol
+
+
+@_functools.lru_cache(maxsize=2 ** 6)
+def _cached_permutation_tensor(metric_bytes, dtype, nof_dimensions, nof_indices, nof_indices_raised):
+    metric_tensor = _np.frombuffer(metric_bytes, dtype=dtype).reshape(nof_dimensions, nof_dimensions)
+    result = _permutation_tensor(metric_tensor, nof_indices, nof_indices_raised)
+    result.setflags(write=False)
+    return result
+
+
+def _permutation_tensor(metric_tensor, nof_indices, nof_indices_raised):
     coeff = _np.sqrt(_np.abs(_np.linalg.det(metric_tensor)))
-    return _np.array(
-        [
-            coeff * permutation_symbol(*indices)
-            for indices in _itertools.product(range(0, nof_dimensions), repeat=nof_indices)
-        ]
-    ).reshape((nof_dimensions,) * nof_indices, order="C")
+    result = coeff * levi_civita_symbol(max(metric_tensor.shape), nof_indices)
+    return musical_isomorphism_sharp(metric_tensor, result, nof_indices_raised) if nof_indices_raised else result
+
+
+def permutation_tensor(metric_tensor, nof_indices, nof_indices_raised=0):
+    r"""
+	:math:`\sqrt{|\det g|}\,\varepsilon_{i_1\ldots i_k}` with the first ``nof_indices_raised`` indices raised.
+
+	NOTE: cached for numeric metrics (keyed by the bytes of the metric), the returned array is then read only
+
+	:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`
+	:param nof_indices: number of indices
+	:param nof_indices_raised: number of (leading) indices that are raised
+	"""
+    metric_tensor = _np.asarray(metric_tensor)
+    if metric_tensor.dtype.hasobject:
+        return _permutation_tensor(metric_tensor, nof_indices, nof_indices_raised)
+    return _cached_permutation_tensor(
+        _np.ascontiguousarray(metric_tensor).tobytes(),
+        metric_tensor.dtype.str,
+        max(metric_tensor.shape),
+        nof_indices,
+        nof_indices_raised,
+    )
+
+
+def create_covariant_permutation_tensor(metric_tensor, nof_indices):
+    return permutation_tensor(metric_tensor, nof_indices)
 
 
 def create_contravariant_permutation_tensor(metric_tensor, nof_indices):
-    return musical_isomorphism_sharp(
-        metric_tensor, create_covariant_permutation_tensor(metric_tensor, nof_indices), nof_indices,
+    return permutation_tensor(metric_tensor, nof_indices, nof_indices)
+
+
+@_functools.lru_cache(maxsize=2 ** 6)
+def _index_sets(nof_dimensions, degree):
+    r"""
+	Increasing index sets :math:`I` of ``degree`` indices (in :py:func:`itertools.combinations` order), the position of
+	the increasing complement :math:`J` among the index sets of ``nof_dimensions - degree`` indices and the sign
+	:math:`\varepsilon_{IJ}`.
+
+	NOTE: cached, the returned arrays are read only
+	"""
+    index_sets = list(_itertools.combinations(range(0, nof_dimensions), degree))
+    position = {
+        index_set: index
+        for index, index_set in enumerate(_itertools.combinations(range(0, nof_dimensions), nof_dimensions - degree))
+    }
+    complements = [tuple(i for i in range(0, nof_dimensions) if i not in index_set) for index_set in index_sets]
+    result = (
+        _np.array(index_sets, dtype=int).reshape(len(index_sets), degree),
+        _np.array([position[complement] for complement in complements], dtype=int),
+        _np.array([levi_civita_symbol(nof_dimensions)[I + J] for I, J in zip(index_sets, complements)], dtype=int),
+    )
+    for array in result:
+        array.setflags(write=False)
+    return result
+
+
+def compressed_form(form, degree):
+    r"""
+	:param form: antisymmetric components :math:`\alpha_{i_1\ldots i_k}` of shape (..., n, ..., n)
+	:param degree: :math:`k`
+	:return: components :math:`\alpha_I` for the increasing index sets :math:`I`, of shape (..., C(n, k))
+	"""
+    form = _np.asarray(form)
+    if degree == 0:
+        return form[..., None]
+    index_sets, _, _ = _index_sets(form.shape[-1], degree)
+    return form[(Ellipsis,) + tuple(index_sets.T)]
+
+
+def expanded_form(components, nof_dimensions, degree):
+    r"""
+	Inverse of :py:func:`compressed_form`
+
+	:param components: components :math:`\alpha_I` of shape (..., C(n, k))
+	:return: antisymmetric components :math:`\alpha_{i_1\ldots i_k}` of shape (..., n, ..., n)
+	"""
+    components = _np.asarray(components)
+    if degree == 0:
+        return components[..., 0]
+    index_sets, _, _ = _index_sets(nof_dimensions, degree)
+    signs = levi_civita_symbol(degree)
+    form = _np.zeros(components.shape[:-1] + (nof_dimensions,) * degree, dtype=components.dtype)
+    for permutation in _itertools.permutations(range(0, degree)):
+        sign = signs[permutation]
+        form[(Ellipsis,) + tuple(index_sets[:, permutation].T)] = components if sign == 1 else -components
+    return form
+
+
+def _antisymmetrised_components(tensor, degree):
+    r"""
+	:return: :math:`\frac{1}{k!}\sum_\sigma \operatorname{sgn}(\sigma)\alpha_{\sigma(I)}` for the increasing index
+		sets :math:`I`, i.e. :py:func:`compressed_form` of the antisymmetrisation of the tensor
+	"""
+    if degree < 2:
+        return compressed_form(tensor, degree)
+    index_sets, _, _ = _index_sets(tensor.shape[-1], degree)
+    signs = levi_civita_symbol(degree)
+    components = sum(
+        signs[permutation] * tensor[(Ellipsis,) + tuple(index_sets[:, permutation].T)]
+        for permutation in _itertools.permutations(range(0, degree))
     )
+    return components / _math.factorial(degree)
+
+
+def _hodge_star_operator(metric_tensor, degree):
+    nof_dimensions = metric_tensor.shape[-1]
+    index_sets, complement_positions, signs = _index_sets(nof_dimensions, degree)
+    volume = _np.sqrt(_np.abs(_np.linalg.det(metric_tensor)))
+    if degree == 0:
+        compound = _np.ones(metric_tensor.shape[:-2] + (1, 1))
+    else:
+        inverse_metric_tensor = _np.linalg.inv(metric_tensor)
+        minors = inverse_metric_tensor[..., index_sets[:, None, :, None], index_sets[None, :, None, :]]
+        compound = _np.linalg.det(minors)
+    operator = _np.zeros(compound.shape, dtype=compound.dtype)
+    operator[..., complement_positions, :] = (volume[..., None, None] * signs[:, None]) * compound
+    return operator
+
+
+@_functools.lru_cache(maxsize=2 ** 6)
+def _cached_hodge_star_operator(metric_bytes, dtype, nof_dimensions, degree):
+    metric_tensor = _np.frombuffer(metric_bytes, dtype=dtype).reshape(nof_dimensions, nof_dimensions)
+    operator = _hodge_star_operator(metric_tensor, degree)
+    operator.setflags(write=False)
+    return operator
+
 
+def hodge_star_operator(metric_tensor, degree):
+    r"""
+	Hodge star on :math:`k`-forms as a matrix acting on the components of :py:func:`compressed_form`:
+
+	.. math::
+		(\star\alpha)_J = \sqrt{|\det g|}\,\varepsilon_{IJ}\,\alpha^I,
+		\quad \alpha^I = \sum_K \det\left((g^{-1})_{IK}\right)\alpha_K
+
+	where :math:`I` is the increasing complement of :math:`J`, i.e.
+	:math:`\frac{1}{k!}\sqrt{|\det g|}\,\alpha^{i_1\ldots i_k}\varepsilon_{i_1\ldots i_k j_1\ldots j_{n-k}}`
+	summed over increasing index sets only.
+
+	NOTE: cached for a single numeric metric (keyed by the bytes of the metric), the returned array is then read only
+
+	:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`, of shape (n, n) or (..., n, n) for a batch of metrics
+	:param degree: :math:`k`
+	:return: array of shape (..., C(n, n - k), C(n, k))
+	"""
+    metric_tensor = _np.asarray(metric_tensor)
+    if metric_tensor.ndim > 2:
+        return _hodge_star_operator(metric_tensor, degree)
+    return _cached_hodge_star_operator(
+        _np.ascontiguousarray(metric_tensor).tobytes(), metric_tensor.dtype.str, metric_tensor.shape[-1], degree
+    )
 
-def hodge_star(metric_tensor, tensor):
-    """https://en.wikipedia.org/wiki/Hodge_star_operator#Expression_in_index_notation
+
+def hodge_star(metric_tensor, tensor, *, nof_batch_axes=None):
+    r"""https://en.wikipedia.org/wiki/Hodge_star_operator#Expression_in_index_notation
 	http://phys.columbia.edu/~cyr/notes/Electrodynamics/CPope-DiffForms-p56-67.pdf
+
+	:math:`(\star\alpha)_{j_1\ldots j_{n-k}} = \frac{1}{k!}\sqrt{|\det g|}\,\alpha^{i_1\ldots i_k}\varepsilon_{i_1\ldots i_k j_1\ldots j_{n-k}}`,
+	computed with :py:func:`hodge_star_operator` on the increasing index sets
+
+	NOTE: a tensor that is not antisymmetric is antisymmetrised first (as the sum over all index tuples does)
+
+	:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`, optionally with leading batch (e.g. grid) axes
+	:param tensor: components :math:`\alpha_{i_1\ldots i_k}`, optionally with leading batch axes
+	:param nof_batch_axes: number of leading batch axes of the tensor, defaults to those of the metric
+	:return: antisymmetric components of :math:`\star\alpha`
 	"""
-    nof_indices = len(tensor.shape)
-    nof_dimensions = max(metric_tensor.shape)
-    permutation_tensor_cov = create_covariant_permutation_tensor(metric_tensor, nof_dimensions)
-    permutation_tensor_con_cov = musical_isomorphism_sharp(metric_tensor, permutation_tensor_cov, nof_indices)
-    coefficient = 1.0 / _np.math.factorial(nof_dimensions - nof_indices)
-    return _np.array(
+    metric_tensor = _np.asarray(metric_tensor)
+    tensor = _np.asarray(tensor)
+    nof_batch_axes = metric_tensor.ndim - 2 if nof_batch_axes is None else nof_batch_axes
+    nof_dimensions = metric_tensor.shape[-1]
+    degree = tensor.ndim - nof_batch_axes
+    operator = hodge_star_operator(metric_tensor, degree)
+    components = _np.einsum("...ji,...i->...j", operator, _antisymmetrised_components(tensor, degree))
+    return expanded_form(components, nof_dimensions, nof_dimensions - degree)
+
+
+def _antisymmetrised_derivative(partial_derivatives, derivative_axis):
+    r"""
+	:param partial_derivatives: :math:`\partial_{i_0}\alpha_{i_1\ldots i_k}`, with the derivative index at
+		``derivative_axis``, followed by the :math:`k` indices of the form
+	:return: :math:`(d\alpha)_{i_0\ldots i_k} = \sum_p (-1)^p \partial_{i_p}\alpha_{i_0\ldots\widehat{i_p}\ldots i_k}`
+	"""
+    degree = partial_derivatives.ndim - derivative_axis - 1
+    return sum(
+        (-1) ** position * _np.moveaxis(partial_derivatives, derivative_axis, derivative_axis + position)
+        for position in range(0, degree + 1)
+    )
+
+
+def _exterior_derivative_components(exterior_derivative, form, nof_dimensions):
+    degree = _np.ndim(form)
+    partial_derivatives = _np.array(
         [
-            sum(
-                [
-                    coefficient * tensor[I_k] * permutation_tensor_con_cov[I_k + I_rest]
-                    for I_k in _itertools.product(range(0, nof_dimensions), repeat=nof_indices)
-                ]
-            )
-            for I_rest in _itertools.product(range(0, nof_dimensions), repeat=nof_dimensions - nof_indices)
+            exterior_derivative(form[I])[j]
+            for j in range(0, nof_dimensions)
+            for I in _itertools.product(range(0, nof_dimensions), repeat=degree)
         ]
-    ).reshape((nof_dimensions,) * (nof_dimensions - nof_indices), order="C")
+    ).reshape((nof_dimensions,) * (degree + 1))
+    return _antisymmetrised_derivative(partial_derivatives, 0)
 
 
 def grad(exterior_derivative, metric_tensor, function):
@@ -137,13 +348,7 @@ def curl(exterior_derivative, metric_tensor, tensor):
     nof_indices = len(tensor.shape)
     nof_dimensions = max(metric_tensor.shape)
     tensor_b = musical_isomorphism_flat(metric_tensor, tensor, nof_indices)
-    d_tensor_b = _np.array(
-        [
-            exterior_derivative(tensor_b[I])[j]
-            for I in _itertools.product(range(0, nof_dimensions), repeat=nof_indices)
-            for j in range(0, nof_dimensions)
-        ]
-    ).reshape((nof_dimensions,) * (nof_indices + 1))
+    d_tensor_b = _exterior_derivative_components(exterior_derivative, tensor_b, nof_dimensions)
     star_d_tensor_b = hodge_star(metric_tensor, d_tensor_b)
     return musical_isomorphism_sharp(metric_tensor, star_d_tensor_b, nof_dimensions - (nof_indices + 1))
 
@@ -154,15 +359,74 @@ def div(exterior_derivative, metric_tensor, tensor):
 		:param metric_tensor: :math:`g(e_i,e_j) e^i \otimes e^j` also see :func:`projected_metric`
 		:param tensor: :math:`x^i e_i`
 	"""
-    nof_indices = len(tensor.shape)
     nof_dimensions = max(metric_tensor.shape)
-    tensor_flat = musical_isomorphism_flat(metric_tensor, tensor, nof_indices)
+    tensor_flat = musical_isomorphism_flat(metric_tensor, tensor, len(tensor.shape))
     star_tensor_flat = hodge_star(metric_tensor, tensor_flat)
-    d_star_tensor_b = _np.array(
-        [
-            exterior_derivative(star_tensor_flat[I])[j]
-            for I in _itertools.product(range(0, nof_dimensions), repeat=nof_dimensions - nof_indices)
-            for j in range(0, nof_dimensions)
-        ]
-    ).reshape((nof_dimensions,) * (nof_dimensions - nof_indices + 1))
+    d_star_tensor_b = _exterior_derivative_components(exterior_derivative, star_tensor_flat, nof_dimensions)
     return hodge_star(metric_tensor, d_star_tensor_b)
+
+
+# region grid fields
+
+
+def grid_exterior_derivative(form, spacings, stencil_points=(-1, 0, 1)):
+    r"""Exterior derivative of a form sampled on a grid (finite differences along the grid axes)
+		:param form: antisymmetric components :math:`\alpha_{i_1\ldots i_k}` of shape (\*grid, n, ..., n)
+		:param spacings: grid spacing of each grid axis
+		:param stencil_points: see :py:func:`mathematics.finite_difference.grid.derivative`
+		:return: :math:`(d\alpha)_{i_0\ldots i_k} = \sum_p (-1)^p \partial_{i_p}\alpha_{i_0\ldots\widehat{i_p}\ldots i_k}`
+	"""
+    partial_derivatives = _gradient(form, spacings, stencil_points)
+    return _antisymmetrised_derivative(partial_derivatives, len(spacings))
+
+
+def grid_hodge_star(metric_tensor, form, nof_grid_axes):
+    r"""Hodge star of a form sampled on a grid
+		:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`, of shape (n, n) or (\*grid, n, n)
+		:param form: antisymmetric components :math:`\alpha_{i_1\ldots i_k}` of shape (\*grid, n, ..., n)
+		:param nof_grid_axes: number of grid axes
+		:return: :math:`(\star\alpha)_{j_1\ldots j_{n-k}} = \frac{\sqrt{|\det g|}}{k!}\alpha^{i_1\ldots i_k}\varepsilon_{i_1\ldots i_k j_1\ldots j_{n-k}}`
+	"""
+    return hodge_star(metric_tensor, form, nof_batch_axes=nof_grid_axes)
+
+
+def grid_grad(metric_tensor, function, spacings, stencil_points=(-1, 0, 1)):
+    r""":math:`\operatorname{grad} f = (df)^\sharp` on a grid, see :py:func:`grad`
+		:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`, of shape (n, n) or (\*grid, n, n)
+		:param function: :math:`f` of shape (\*grid)
+		:param spacings: grid spacing of each grid axis
+		:return: array of shape (\*grid, n)
+	"""
+    differential = grid_exterior_derivative(function, spacings, stencil_points)
+    return musical_isomorphism_sharp(metric_tensor, differential, 1, nof_batch_axes=len(spacings))
+
+
+def grid_curl(metric_tensor, tensor, spacings, stencil_points=(-1, 0, 1)):
+    r""":math:`\operatorname{curl} X = (\star d X^\flat)^\sharp` on a grid, see :py:func:`curl`
+		:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`, of shape (n, n) or (\*grid, n, n)
+		:param tensor: :math:`X^i e_i` of shape (\*grid, n)
+		:param spacings: grid spacing of each grid axis
+		:return: array of shape (\*grid, n, ..., n) with :math:`n-2` indices (a vector in three dimensions)
+	"""
+    nof_grid_axes = len(spacings)
+    tensor_flat = musical_isomorphism_flat(metric_tensor, tensor, 1, nof_batch_axes=nof_grid_axes)
+    d_tensor_flat = grid_exterior_derivative(tensor_flat, spacings, stencil_points)
+    star_d_tensor_flat = grid_hodge_star(metric_tensor, d_tensor_flat, nof_grid_axes)
+    return musical_isomorphism_sharp(metric_tensor, star_d_tensor_flat, nof_batch_axes=nof_grid_axes)
+
+
+def grid_div(metric_tensor, tensor, spacings, stencil_points=(-1, 0, 1)):
+    r""":math:`\operatorname{div} X = \star d \star X^\flat` on a grid, see :py:func:`div`
+		:param metric_tensor: :math:`g(e_i,e_j)e^i\otimes e^j`, of shape (n, n) or (\*grid, n, n)
+		:param tensor: :math:`X^i e_i` of shape (\*grid, n)
+		:param spacings: grid spacing of each grid axis
+		:return: array of shape (\*grid)
+	"""
+    nof_grid_axes = len(spacings)
+    tensor_flat = musical_isomorphism_flat(metric_tensor, tensor, 1, nof_batch_axes=nof_grid_axes)
+    star_tensor_flat = grid_hodge_star(metric_tensor, tensor_flat, nof_grid_axes)
+    d_star_tensor_flat = grid_exterior_derivative(star_tensor_flat, spacings, stencil_points)
+    return grid_hodge_star(metric_tensor, d_star_tensor_flat, nof_grid_axes)
+
+
+# endregion
@@ -0,0 +1,143 @@
+r"""
+Levi-Civita connection and curvature of a metric, computed componentwise on batches of points
+"""
+
+__all__ = ["MetricGeometry"]
+import functools as _functools
+import itertools as _itertools
+
+import numpy as _np
+
+from ..finite_difference.grid import gradient as _gradient
+
+
+class MetricGeometry:
+    r"""
+    Christoffel symbols, Riemann, Ricci and scalar curvature from the components of a metric and its first and second
+    partial derivatives, for a batch of points at once.
+
+    Array layout (the batch axes ``...`` come first, e.g. grid axes or a list of points):
+
+    * metric :math:`g_{ij}`: (..., n, n)
+    * first derivatives :math:`\partial_a g_{ij}`: (..., n, n, n)
+    * second derivatives :math:`\partial_a\partial_b g_{ij}`: (..., n, n, n, n)
+
+    The derivatives of the metric are computed once; every derived quantity is computed on first access
+    (with :py:func:`numpy.einsum`) and cached, so e.g. the Christoffel symbols are shared by the curvature tensors.
+    The derivatives of the Christoffel symbols are computed from the second derivatives of the metric,
+    not by differentiating the Christoffel symbols numerically.
+    """
+
+    def __init__(self, metric_tensor, first_derivatives, second_derivatives):
+        self.metric_tensor = _np.asarray(metric_tensor)
+        self.first_derivatives = _np.asarray(first_derivatives)
+        self.second_derivatives = _np.asarray(second_derivatives)
+
+    @classmethod
+    def from_grid(cls, metric_tensor, spacings, stencil_points=(-2, -1, 0, 1, 2)):
+        """
+        :param metric_tensor: metric sampled on a grid, of shape (\\*grid, n, n)
+        :param spacings: grid spacing of each grid axis
+        :param stencil_points: see :py:func:`mathematics.finite_difference.grid.derivative`
+        """
+        first_derivatives = _gradient(metric_tensor, spacings, stencil_points)
+        second_derivatives = _gradient(first_derivatives, spacings, stencil_points)
+        return cls(metric_tensor, first_derivatives, second_derivatives)
+
+    @classmethod
+    def from_function(cls, metric_function, points, step=1e-3):
+        """
+        The derivatives are (second order) central differences. The metric function is called once,
+        on all points and all their displaced copies.
+
+        :param metric_function: function from points of shape (..., n) to metrics of shape (..., n, n)
+        :param points: points of shape (..., n)
+        :param step: finite difference step
+        """
+        points = _np.asarray(points, dtype=float)
+        nof_dimensions = points.shape[-1]
+        unit = _np.eye(nof_dimensions) * step
+        offsets = [_np.zeros(nof_dimensions)]
+        offsets += [sign * unit[a] for a in range(0, nof_dimensions) for sign in (1, -1)]
+        offsets += [
+            first_sign * unit[a] + second_sign * unit[b]
+            for a, b in _itertools.combinations(range(0, nof_dimensions), 2)
+            for first_sign in (1, -1)
+            for second_sign in (1, -1)
+        ]
+        displaced = points[None, ...] + _np.reshape(offsets, (len(offsets),) + (1,) * (points.ndim - 1) + (-1,))
+        values = iter(_np.asarray(metric_function(displaced)))
+        metric_tensor = next(values)
+        first_derivatives = _np.zeros(points.shape + (nof_dimensions, nof_dimensions))
+        second_derivatives = _np.zeros(points.shape + (nof_dimensions,) * 3)
+        for a in range(0, nof_dimensions):
+            forward, backward = next(values), next(values)
+            first_derivatives[..., a, :, :] = (forward - backward) / (2 * step)
+            second_derivatives[..., a, a, :, :] = (forward - 2 * metric_tensor + backward) / step ** 2
+        for a, b in _itertools.combinations(range(0, nof_dimensions), 2):
+            forward_forward, forward_backward, backward_forward, backward_backward = (next(values) for _ in range(4))
+            mixed = (forward_forward - forward_backward - backward_forward + backward_backward) / (4 * step ** 2)
+            second_derivatives[..., a, b, :, :] = mixed
+            second_derivatives[..., b, a, :, :] = mixed
+        return cls(metric_tensor, first_derivatives, second_derivatives)
+
+    @_functools.cached_property
+    def inverse_metric_tensor(self):
+        r""":math:`g^{ij}`"""
+        return _np.linalg.inv(self.metric_tensor)
+
+    @_functools.cached_property
+    def christoffel_symbols_of_the_first_kind(self):
+        r""":math:`\Gamma_{ljk} = \frac{1}{2}(\partial_j g_{lk} + \partial_k g_{lj} - \partial_l g_{jk})`"""
+        dg = self.first_derivatives
+        return 0.5 * (_np.einsum("...jlk->...ljk", dg) + _np.einsum("...klj->...ljk", dg) - dg)
+
+    @_functools.cached_property
+    def christoffel_symbols(self):
+        r""":math:`\Gamma^i_{jk} = g^{il}\Gamma_{ljk}`"""
+        return _np.einsum(
+            "...il,...ljk->...ijk", self.inverse_metric_tensor, self.christoffel_symbols_of_the_first_kind
+        )
+
+    @_functools.cached_property
+    def christoffel_symbol_derivatives(self):
+        r"""
+        :math:`\partial_m\Gamma^i_{jk} = (\partial_m g^{il})\Gamma_{ljk} + g^{il}\partial_m\Gamma_{ljk}`,
+        where :math:`\partial_m g^{il} = -g^{ia}(\partial_m g_{ab})g^{bl}`
+
+        :return: array of shape (..., n, n, n, n), indexed as [..., m, i, j, k]
+        """
+        ddg = self.second_derivatives
+        first_kind_derivatives = 0.5 * (_np.einsum("...mjlk->...mljk", ddg) + _np.einsum("...mklj->...mljk", ddg) - ddg)
+        inverse = self.inverse_metric_tensor
+        inverse_derivatives = -_np.einsum("...ia,...mab,...bl->...mil", inverse, self.first_derivatives, inverse)
+        return _np.einsum(
+            "...mil,...ljk->...mijk", inverse_derivatives, self.christoffel_symbols_of_the_first_kind
+        ) + _np.einsum("...il,...mljk->...mijk", inverse, first_kind_derivatives)
+
+    @_functools.cached_property
+    def riemann(self):
+        r"""
+        :math:`R^i{}_{jkl} = \partial_k\Gamma^i_{lj} - \partial_l\Gamma^i_{kj}
+        + \Gamma^i_{km}\Gamma^m_{lj} - \Gamma^i_{lm}\Gamma^m_{kj}`
+
+        :return: array of shape (..., n, n, n, n), indexed as [..., i, j, k, l]
+        """
+        dG = self.christoffel_symbol_derivatives
+        G = self.christoffel_symbols
+        return (
+            _np.einsum("...kilj->...ijkl", dG)
+            - _np.einsum("...likj->...ijkl", dG)
+            + _np.einsum("...ikm,...mlj->...ijkl", G, G)
+            - _np.einsum("...ilm,...mkj->...ijkl", G, G)
+        )
+
+    @_functools.cached_property
+    def ricci(self):
+        r""":math:`R_{jl} = R^i{}_{jil}`"""
+        return _np.einsum("...ijil->...jl", self.riemann)
+
+    @_functools.cached_property
+    def scalar_curvature(self):
+        r""":math:`R = g^{jl}R_{jl}`"""
+        return _np.einsum("...jl,...jl->...", self.inverse_metric_tensor, self.ricci)
@@ -33,9 +33,16 @@ class PointwiseCalculus(_Pointwise):
         return [koszul[i] * ei for i, ei in enumerate(gramianInverse)]
 
     def connection(self, rhs, g, E):
-        return self.derivation()(abs(rhs)) * (rhs / abs(rhs)) + abs(rhs) * PointwiseCalculus.KoszulExpansion(
-            g, self, rhs / abs(rhs), E
-        )
+        operands = (self, rhs, g, E)
+        node = type(self)._interned(PointwiseCalculus.connection, operands)
+        if node is None:
+            norm = abs(rhs).memoize()
+            direction = (rhs / norm).memoize()
+            expansion = PointwiseCalculus.KoszulExpansion(g, self, direction, E)
+            node = type(self)._node(
+                self.derivation()(norm) * direction + norm * expansion, PointwiseCalculus.connection, operands
+            )
+        return node
 
     def torsion(self, rhs, g, E):
         # assert isinstance(rhs, Pointwise)
@@ -52,7 +59,7 @@ class PointwiseCalculus(_Pointwise):
                 - self.commutator(rhs).connection(application, g, E)
             )
 
-        return type(self)(__riemann)
+        return type(self)._node(__riemann, PointwiseCalculus.riemann, (self, rhs, g, E))
 
     def commutator(self, rhs):
         # assert isinstance(rhs, Pointwise)
@@ -60,7 +67,7 @@ class PointwiseCalculus(_Pointwise):
         return self.derivation().after(rhs.derivation()) - rhs.derivation().after(self.derivation())
 
     def derivation(self):
-        return type(self)(_directional_derivative(self))
+        return type(self)._node(_directional_derivative(self), PointwiseCalculus.derivation, (self,))
 
     def derivative(self):
         def __derivative_in_direction(direction):
@@ -71,4 +78,4 @@ class PointwiseCalculus(_Pointwise):
             else:
                 raise NotImplementedError()
 
-        return type(self)(__derivative_in_direction)
+        return type(self)._node(__derivative_in_direction, PointwiseCalculus.derivative, (self,))
@@ -0,0 +1,66 @@
+r"""
+Finite difference derivatives of fields sampled on regular grids, vectorised along the grid axes
+"""
+
+__all__ = ["derivative", "gradient"]
+import functools as _functools
+
+import numpy as _np
+
+from .schema import one_dimensional_schema
+
+
+@_functools.lru_cache(maxsize=2 ** 8)
+def _weights(stencil_points, derivative_order):
+    weights = one_dimensional_schema(stencil_points, derivative_order)
+    weights.setflags(write=False)
+    return weights
+
+
+def derivative(field, axis, spacing=1.0, stencil_points=(-1, 0, 1), derivative_order=1):
+    """
+    Derivative of a field along one grid axis with the weights of :py:func:`one_dimensional_schema`.
+
+    Interior points are computed with one array operation per stencil point. Near the boundary the stencil is
+    shifted so that it stays inside the grid (one sided differences of the same order of accuracy).
+
+    :param field: array with the grid axis ``axis`` (other axes are carried along, e.g. components)
+    :param axis: grid axis to differentiate along
+    :param spacing: grid spacing along the axis
+    :param stencil_points: stencil points (in units of the spacing)
+    :param derivative_order: order of the derivative
+    :return: array of the same shape as the field
+    """
+    field = _np.asarray(field)
+    stencil_points = tuple(int(point) for point in stencil_points)
+    size = field.shape[axis]
+    if size < len(stencil_points):
+        raise ValueError("{0} grid points along axis {1}, the stencil needs {2}".format(size, axis, len(stencil_points)))
+    scale = 1.0 / spacing ** derivative_order
+    lower = max(0, -min(stencil_points))
+    upper = max(0, max(stencil_points))
+    values = _np.moveaxis(field, axis, 0)
+    result = _np.zeros(values.shape, dtype=_np.result_type(field, float))
+    weights = _weights(stencil_points, derivative_order)
+    for weight, point in zip(weights, stencil_points):
+        result[lower : size - upper] += (scale * weight) * values[lower + point : size - upper + point]
+    for index in list(range(0, lower)) + list(range(max(lower, size - upper), size)):
+        shift = max(0, -(index + min(stencil_points))) - max(0, index + max(stencil_points) - (size - 1))
+        shifted_points = tuple(point + shift for point in stencil_points)
+        for weight, point in zip(_weights(shifted_points, derivative_order), shifted_points):
+            result[index] += (scale * weight) * values[index + point]
+    return _np.moveaxis(result, 0, axis)
+
+
+def gradient(field, spacings, stencil_points=(-1, 0, 1)):
+    """
+    Partial derivatives along all grid axes.
+
+    :param field: array of shape (\\*grid, \\*components), with the grid axes first
+    :param spacings: grid spacing of each grid axis
+    :return: array of shape (\\*grid, len(spacings), \\*components), the derivative index right after the grid axes
+    """
+    return _np.stack(
+        [derivative(field, axis, spacing, stencil_points) for axis, spacing in enumerate(spacings)],
+        axis=len(spacings),
+    )
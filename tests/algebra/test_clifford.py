@@ -6,6 +6,7 @@ import numpy as np
 import pytest
 
 from mathematics.algebra.create import *
+from mathematics.algebra.tensor import Tensor
 from mathematics.tools.decorators import timeout
 
 
@@ -120,3 +121,213 @@ class TestClifford:
         assert i * j * k == -I
 
         pass
+
+    def test_orthogonal_basis_uses_blade_algebra(self):
+        basis = tuple(sympy.symbols("e_{0:4}"))
+        signature = dict(zip(basis, (1, 1, 1, -1)))
+
+        def scalar_product(ei, ej):
+            return signature[ei] if ei == ej else 0
+
+        Spacetime = create_clifford("Spacetime Algebra", scalar_product)
+        a = Spacetime({(basis[2], basis[0]): 2, (basis[3],): 1, (): 3})
+        b = Spacetime({(basis[0], basis[3], basis[0]): 5, (basis[1],): -1})
+        assert Spacetime.blade_algebra(basis) is not None
+        expected = Spacetime(Tensor.__mul__(a, b)).simplify()
+        assert a * b == Spacetime({key: value for key, value in expected.items() if value != 0})
+
+    def test_dense_product(self):
+        basis = tuple(sympy.symbols("e_{0:4}"))
+        signature = dict(zip(basis, (1, 1, 1, -1)))
+
+        def scalar_product(ei, ej):
+            return signature[ei] if ei == ej else 0
+
+        Spacetime = create_clifford("Dense Spacetime Algebra", scalar_product)
+        blades = [key for grade in range(0, 5) for key in itertools.combinations(basis, grade)]
+        rng = np.random.default_rng(31)
+        a, b = (Spacetime({key: float(value) for key, value in zip(blades, rng.normal(size=16))}) for _ in range(2))
+        assert len(a) * len(b) >= Spacetime.blade_algebra(basis).dense_product_size
+        expected = Spacetime(Tensor.__mul__(a, b)).simplify()
+        product = a * b
+        assert set(product) == set(expected)
+        assert all(np.isclose(product[key], value) for key, value in expected.items())
+
+    def test_scalar_blade_algebra_is_cached(self):
+        Scalar = create_clifford("Scalar Algebra", lambda ei, ej: 0)
+        algebra = Scalar.blade_algebra(set())
+        assert algebra is not None and algebra.dimension == 0
+        assert Scalar.blade_algebra(set()) is algebra
+        assert Scalar({(): 2}) * Scalar({(): 3}) == Scalar({(): 6})
+        assert Scalar.blade_algebra(set()) is algebra
+
+    def test_non_orthogonal_basis_has_no_blade_algebra(self):
+        basis = tuple(sympy.symbols("e_{0:2}"))
+
+        def scalar_product(ei, ej):
+            return 1
+
+        Multivector = create_clifford("Non Orthogonal Algebra", scalar_product)
+        assert Multivector.blade_algebra(basis) is None
+        e1 = Multivector({basis[0]: 1})
+        e2 = Multivector({basis[1]: 1})
+        assert (e1 * e2 + e2 * e1).without_zeros() == Multivector({(): 2})
+
+    def test_errors_in_the_bilinear_form_are_raised(self):
+        basis = tuple(sympy.symbols("e_{0:2}"))
+
+        def scalar_product(ei, ej):
+            return undefined_name
+
+        Multivector = create_clifford("Broken Form Algebra", scalar_product)
+        with pytest.raises(NameError):
+            Multivector.blade_algebra(basis)
+
+    def test_cayley_table(self, monkeypatch):
+        basis = tuple(sympy.symbols("e_{0:3}"))
+
+        def scalar_product(ei, ej):
+            return 1 if ei == ej else sympy.Rational(1, 2)
+
+        Multivector = create_clifford("Cayley Table Algebra", scalar_product)
+        assert Multivector.blade_algebra(basis) is None
+        a = Multivector({(basis[1], basis[0]): 2, (basis[2],): 1, (): 3})
+        b = Multivector({(basis[0], basis[2]): 5, (basis[1],): -1})
+        expected = Multivector(Tensor.__mul__(a, b)).simplify()
+        assert a * b == Multivector({key: value for key, value in expected.items() if value != 0})
+        assert ((basis[1], basis[0]), (basis[0], basis[2])) in Multivector.cayley_table()
+        assert len(Multivector.precompute_cayley_table(basis)) >= 4 ** len(basis)
+
+        monkeypatch.setattr(Multivector, "cayley_table_size", 2)
+        assert dict(Multivector.blade_product((basis[2], basis[0]), (basis[1],))) == {
+            (basis[0], basis[1], basis[2]): 1,
+            (basis[0],): -1,
+            (basis[1],): 1,
+        }
+        assert len(Multivector.cayley_table()) == 2
+        assert list(Multivector.cayley_table())[-1] == ((basis[2], basis[0]), (basis[1],))
+
+    def test_simplify_in_one_pass(self):
+        basis = tuple(sympy.symbols("e_{0:3}"))
+        a, b = sympy.symbols("a b")
+
+        def scalar_product(ei, ej):
+            return 1 if ei == ej else a if {ei, ej} == {basis[0], basis[2]} else b
+
+        Multivector = create_clifford("Canonical Form Algebra", scalar_product)
+        rng = np.random.default_rng(33)
+        for _ in range(10):
+            terms = {tuple(basis[index] for index in rng.integers(0, 3, size=rng.integers(0, 6))): 1 for _ in range(3)}
+            simplified = Multivector(terms).simplify()
+            stepwise = Multivector()
+            for key in terms:
+                product = Multivector({(): 1})
+                for slot in key:
+                    product = product * Multivector({(slot,): 1})
+                stepwise = stepwise + product
+            stepwise = {key: sympy.expand(value) for key, value in stepwise.items() if sympy.expand(value) != 0}
+            assert {key: sympy.expand(value) for key, value in simplified.items()} == stepwise
+            assert all(list(key) == sorted(set(key), key=repr) for key in simplified)
+        e0, e1, e2 = basis
+        assert Multivector({(e1, e0): 1}).simplify() == Multivector({(e0, e1): -1, (): 2 * b})
+        assert Multivector({(e2, e0, e2): 1}).simplify() == Multivector({(e0,): -1, (e2,): 2 * a})
+
+    def test_graded_operations(self):
+        basis = tuple(sympy.symbols("e_{0:3}"))
+
+        def scalar_product(ei, ej):
+            return 1 if ei == ej else 0
+
+        Multivector = create_clifford("Graded Euclidean Algebra", scalar_product)
+        I = Multivector({(): 1})
+        e1, e2, e3 = (Multivector({(base,): 1}) for base in basis)
+        A = 2 * I + 3 * e1 + e1 * e2 - e1 * e2 * e3
+
+        assert A.grade(0) == 2 * I
+        assert A.grade(1) == 3 * e1
+        assert A.grade(2) == e1 * e2
+        assert A.grade(3) == -e1 * e2 * e3
+        assert sorted(A.graded()) == [0, 1, 2, 3]
+        assert A.reverse() == 2 * I + 3 * e1 - e1 * e2 + e1 * e2 * e3
+        assert A.grade_involution() == 2 * I - 3 * e1 + e1 * e2 + e1 * e2 * e3
+        assert A.conjugate() == 2 * I - 3 * e1 - e1 * e2 - e1 * e2 * e3
+
+        assert e1.wedge(e2) == e1 * e2
+        assert e1.wedge(e1) == Multivector()
+        assert e1.left_contraction(e1 * e2) == e2
+        assert (e1 * e2).left_contraction(e1) == Multivector()
+        assert (e1 * e2).right_contraction(e2) == e1
+        assert (e1 * e2).scalar_product((e1 * e2).reverse()) == 1
+        v = e1 + 2 * e3
+        assert v * A == v.left_contraction(A) + v.wedge(A)
+
+    def test_graded_operations_need_orthogonal_basis(self):
+        basis = tuple(sympy.symbols("e_{0:2}"))
+
+        def scalar_product(ei, ej):
+            return 1 if ei == ej else sympy.Rational(1, 3)
+
+        Multivector = create_clifford("Graded Non Orthogonal Algebra", scalar_product)
+        e1, e2 = (Multivector({(base,): 1}) for base in basis)
+        with pytest.raises(NotImplementedError):
+            (e1 * e2).grade(2)
+        with pytest.raises(NotImplementedError):
+            e1.wedge(e2)
+        assert (e1 * e2).reverse() == e2 * e1
+        assert (e1 * e2 + e1).grade_involution() == e1 * e2 - e1
+        assert (e1 * e2 + e1).conjugate() == e2 * e1 - e1
+
+    def test_symbolic_coefficients(self):
+        basis = tuple(sympy.symbols("e_{0:3}"))
+        a, b, c = sympy.symbols("a b c")
+
+        def scalar_product(ei, ej):
+            return 1 if ei == ej else 0
+
+        Multivector = create_clifford(
+            "Symbolic Euclidean Algebra", scalar_product, coefficient_simplifier=sympy.expand, product_cache_size=8
+        )
+        A = Multivector({(): a, (basis[0],): b, (basis[0], basis[1]): c})
+        B = Multivector({(): a + b, (basis[1],): c - a})
+        product = A * B
+        Unsimplified = create_clifford("Unsimplified Symbolic Euclidean Algebra", scalar_product)
+        expected = Unsimplified(A) * Unsimplified(B)
+        assert product == Multivector({key: sympy.expand(value) for key, value in expected.items()})
+        assert all(value == sympy.expand(value) for value in product.values())
+        assert len(Multivector.product_cache()) == 1
+        assert A * B == product
+
+        function = (product * product).lambdify((a, b, c))
+        values = np.random.default_rng(37).normal(size=(3, 5))
+        evaluated = function(*values)
+        assert evaluated.shape == (5, len(function.keys))
+        for index, key in enumerate(function.keys):
+            expected = sympy.lambdify((a, b, c), (product * product)[key])(*values)
+            assert np.allclose(evaluated[:, index], expected)
+
+        function = Multivector({basis[0]: a, (basis[1],): 2 * a}).lambdify((a,))
+        assert function.keys == [(basis[0],), (basis[1],)]
+        assert np.allclose(function(3.0), [3.0, 6.0])
+
+    def test_hash(self):
+        basis = tuple(sympy.symbols("e_{0:2}"))
+
+        def scalar_product(ei, ej):
+            return 1 if ei == ej else 0
+
+        Multivector = create_clifford("Hashable Euclidean Algebra", scalar_product)
+        e1, e2 = (Multivector({(base,): 1}) for base in basis)
+        A = e1 * e2 + e1
+        B = e1 + e1 * e2
+        assert A == B and hash(A) == hash(B)
+        assert hash(e1) != hash(e2)
+        assert len({A, B, e1, e2}) == 3
+        cache = {A: "A"}
+        assert cache[B] == "A"
+
+        B[(basis[1],)] = 3
+        assert B != A and hash(B) == hash(A + 3 * e2)
+        del B[(basis[1],)]
+        assert hash(B) == hash(A)
+        B.clear()
+        assert hash(B) == hash(Multivector())
@@ -0,0 +1,88 @@
+import itertools
+
+import numpy as np
+
+from mathematics.algebra.exterior_algebra import (
+    Form,
+    exterior_product,
+    exterior_product_arrays,
+    form_basis,
+    hodge_star,
+    hodge_star_inverse,
+    hodge_star_operator,
+)
+from mathematics.algebra.tensor import Tensor
+
+
+class TestExteriorProduct:
+    def test_one_forms(self):
+        dx, dy, dz = (Form({(index,): 1}) for index in range(0, 3))
+        assert exterior_product(dx, dy) == Form({(0, 1): 1})
+        assert exterior_product(dy, dx) == Form({(0, 1): -1})
+        assert exterior_product(dx, dx) == Form()
+        assert exterior_product(exterior_product(dz, dx), dy) == Form({(0, 1, 2): 1})
+
+    def test_cross_product(self):
+        u = np.array([1.0, 2.0, 3.0])
+        v = np.array([-2.0, 0.5, 4.0])
+        wedge = exterior_product(Tensor({(i,): u[i] for i in range(0, 3)}), Tensor({(i,): v[i] for i in range(0, 3)}))
+        cross = np.cross(u, v)
+        assert np.allclose([wedge[(1, 2)], wedge[(2, 0)], wedge[(0, 1)]], cross)
+
+    def test_associative_and_graded_commutative(self):
+        rng = np.random.default_rng(39)
+
+        def random_form(degree):
+            return Form({key: float(rng.normal()) for key in itertools.combinations(range(0, 5), degree)})
+
+        a, b, c = random_form(1), random_form(2), random_form(2)
+        lhs = exterior_product(exterior_product(a, b), c)
+        rhs = exterior_product(a, exterior_product(b, c))
+        assert lhs.keys() == rhs.keys() and all(np.isclose(lhs[key], rhs[key]) for key in lhs)
+        ab = exterior_product(a, b)
+        ba = exterior_product(b, a)
+        assert all(np.isclose(ab[key], (-1) ** (1 * 2) * ba[key]) for key in ab)
+
+    def test_arrays(self):
+        rng = np.random.default_rng(39)
+        dimension, lhs_degree, rhs_degree = 5, 2, 1
+        a = rng.normal(size=(7, len(form_basis(dimension, lhs_degree))))
+        b = rng.normal(size=(7, len(form_basis(dimension, rhs_degree))))
+        result = exterior_product_arrays(a, b, dimension, lhs_degree, rhs_degree)
+        assert result.shape == (7, len(form_basis(dimension, lhs_degree + rhs_degree)))
+        for n in range(0, 7):
+            expected = exterior_product(
+                Form(zip(form_basis(dimension, lhs_degree), a[n].tolist())),
+                Form(zip(form_basis(dimension, rhs_degree), b[n].tolist())),
+            )
+            for index, key in enumerate(form_basis(dimension, lhs_degree + rhs_degree)):
+                assert np.isclose(result[n, index], expected.get(key, 0))
+
+
+class TestHodgeStar:
+    def test_euclidean(self):
+        g = np.eye(3)
+        assert hodge_star(g, Form({(0,): 1}), 3) == Form({(1, 2): 1})
+        assert hodge_star(g, Form({(1,): 1}), 3) == Form({(0, 2): -1})
+        assert hodge_star(g, Form({(0, 1): 1}), 3) == Form({(2,): 1})
+        assert hodge_star(g, Form({(): 1}), 3) == Form({(0, 1, 2): 1})
+        assert hodge_star(np.diag([4.0, 1.0, 1.0]), Form({(0,): 1}), 3) == Form({(1, 2): 0.5})
+
+    def test_double_star(self):
+        rng = np.random.default_rng(40)
+        for g in (np.diag([-1.0, 1.0, 1.0, 1.0]), np.eye(4) + 0.1 * (lambda m: m + m.T)(rng.normal(size=(4, 4)))):
+            for degree in range(0, 5):
+                a = Form({key: float(rng.normal()) for key in form_basis(4, degree)})
+                twice = hodge_star_inverse(g, hodge_star(g, a, 4), 4)
+                assert all(np.isclose(twice.get(key, 0), value) for key, value in a.items())
+
+    def test_arrays(self):
+        rng = np.random.default_rng(40)
+        g = np.diag([-1.0, 1.0, 1.0, 1.0])
+        a = rng.normal(size=(6, 2, len(form_basis(4, 2))))
+        result = hodge_star(g, a, 4, degree=2)
+        assert result.shape == a.shape
+        assert hodge_star_operator(g, 2) is hodge_star_operator(g.copy(), 2)
+        for index, components in enumerate(a.reshape(-1, a.shape[-1])):
+            star = hodge_star(g, Form(zip(form_basis(4, 2), components.tolist())), 4)
+            assert np.allclose(result.reshape(-1, a.shape[-1])[index], [star.get(key, 0) for key in form_basis(4, 2)])
@@ -0,0 +1,55 @@
+from mathematics.algebra.tensor import Tensor
+from mathematics.algebra.lazy_tensor import LazyTensor
+from mathematics.tools.decorators import timeout
+
+
+def pairing(cov, con):
+    return 1 if cov == con else 0
+
+
+def without_zeros(tensor):
+    return {key: value for key, value in tensor.items() if value != 0}
+
+
+class TestLazyTensor:
+    @timeout(seconds=5)
+    def test_evaluate_equals_eager(self):
+        A = Tensor({(i, j): i - 2 * j for i in range(4) for j in range(4)})
+        B = Tensor({(i, j): i * j + 1 for i in range(4) for j in range(4)})
+        C = Tensor({(i,): i - 1 for i in range(4)})
+        eager = (A * B).trace(0, 2, pairing) + C * C
+        lazy = (A.lazy() * B).trace(0, 2, pairing) + C.lazy() * C
+        assert isinstance(lazy, LazyTensor)
+        assert dict(lazy.evaluate()) == without_zeros(eager)
+
+    def test_plan_fuses_traces_and_shares_subexpressions(self):
+        A = Tensor({(i, j): i + j for i in range(3) for j in range(3)})
+        product = A.lazy() * A
+        expression = product.trace(0, 2, pairing).trace(0, 1, pairing) + product.trace(0, 2, pairing).trace(
+            0, 1, pairing
+        )
+        plan = expression.plan().splitlines()
+        assert plan == [
+            "%0 = tensor[9 terms]",
+            "%1 = contraction(%0, %0; trace(0, 2); trace(0, 1))",
+            "%2 = sum(%1, %1)",
+        ]
+        eager = (A * A).trace(0, 2, pairing).trace(0, 1, pairing)
+        assert dict(expression.evaluate()) == without_zeros(eager + eager)
+
+    def test_zero_terms_are_dropped(self):
+        A = Tensor({(0,): 1, (1,): 0})
+        assert dict((0 * A.lazy() + A).evaluate()) == {(0,): 1}
+        assert (A.lazy() * Tensor()).plan() == "%0 = sum()"
+
+    def test_sum(self):
+        A = Tensor({(0,): 1, (1,): 2})
+        B = Tensor({(1,): 3})
+        assert dict(sum([A.lazy(), B.lazy()]).evaluate()) == {(0,): 1, (1,): 5}
+
+    def test_long_chain(self):
+        A = Tensor({(0,): 1})
+        expression = A.lazy()
+        for _ in range(0, 3000):
+            expression = expression + A
+        assert dict(expression.evaluate()) == {(0,): 3001}
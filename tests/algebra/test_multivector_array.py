@@ -0,0 +1,71 @@
+import numpy as np
+import sympy
+
+from mathematics.algebra.create import create_clifford
+from mathematics.algebra.multivector_array import MultivectorArray
+from mathematics.algebra.versor import apply_versor, rotor_exp
+
+basis = tuple(sympy.symbols("e_{0:3}"))
+
+
+def euclidean(ei, ej):
+    return 1 if ei == ej else 0
+
+
+def random_multivectors(cls, rng, count):
+    blades = [(), *((slot,) for slot in basis), basis[:2], basis[1:], basis[::2], basis]
+    return [
+        cls({blade: float(value) for blade, value in zip(blades, rng.normal(size=len(blades)))}) for _ in range(count)
+    ]
+
+
+class TestMultivectorArray:
+    def test_geometric_product(self):
+        Multivector = create_clifford("Array Euclidean Algebra", euclidean)
+        rng = np.random.default_rng(36)
+        lhs = random_multivectors(Multivector, rng, 20)
+        rhs = random_multivectors(Multivector, rng, 20)
+        A = MultivectorArray.from_multivectors(lhs)
+        B = MultivectorArray.from_multivectors(rhs, A.algebra)
+        assert A.shape == (20,)
+        products = (A * B).to_multivectors(Multivector)
+        for a, b, product in zip(lhs, rhs, products):
+            expected = a * b
+            assert set(product) <= set(expected)
+            assert all(np.isclose(product.get(key, 0), value) for key, value in expected.items())
+        assert np.allclose((A - A + B).coefficients, B.coefficients)
+        assert np.allclose((A * B[3]).coefficients[3], (A[3] * B[3]).coefficients)
+
+    def test_grades(self):
+        Multivector = create_clifford("Array Euclidean Algebra", euclidean)
+        multivectors = random_multivectors(Multivector, np.random.default_rng(36), 5)
+        A = MultivectorArray.from_multivectors(multivectors)
+        for k in range(0, 4):
+            for multivector, projection in zip(multivectors, A.grade(k).to_multivectors(Multivector)):
+                assert projection == multivector.grade(k)
+        for multivector, reverse in zip(multivectors, A.reverse().to_multivectors(Multivector)):
+            assert reverse == multivector.reverse()
+
+    def test_apply_versor(self):
+        Multivector = create_clifford("Array Euclidean Algebra", euclidean)
+        e1, e2, e3 = (Multivector({(slot,): 1}) for slot in basis)
+        R = rotor_exp(-(e1 * e2 - 0.5 * e2 * e3) * 0.7)
+        vectors = np.random.default_rng(36).normal(size=(100, 3))
+        A = MultivectorArray.from_multivectors(
+            [Multivector({(slot,): value for slot, value in zip(basis, vector)}) for vector in vectors.tolist()]
+        )
+        rotated = A.apply_versor(R).coefficients[:, [1, 2, 4]]
+        assert np.allclose(rotated, apply_versor(R, vectors, basis))
+        versors = MultivectorArray.from_multivectors([R] * 100, A.algebra)
+        assert np.allclose(A.apply_versor(versors).coefficients[:, [1, 2, 4]], rotated)
+
+    def test_apply_odd_versor(self):
+        Multivector = create_clifford("Array Euclidean Algebra", euclidean)
+        e1, e2, e3 = (Multivector({(slot,): 1}) for slot in basis)
+        A = MultivectorArray.from_multivectors([e1, e1 * e2, e2 * e3, e1 * e2 * e3])
+        # reflection in the plane orthogonal to e1
+        reflected = A.apply_versor(e1).to_multivectors(Multivector)
+        assert reflected == [-e1, -(e1 * e2), e2 * e3, -(e1 * e2 * e3)]
+        # the pseudoscalar acts as the point reflection
+        versors = MultivectorArray.from_multivectors([e1, e1, e1 * e2, e1 * e2 * e3], A.algebra)
+        assert A.apply_versor(versors).to_multivectors(Multivector) == [-e1, -(e1 * e2), -(e2 * e3), -(e1 * e2 * e3)]
@@ -0,0 +1,195 @@
+import gc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from mathematics.algebra.pointwise import Pointwise
+
+
+class Counted:
+    def __init__(self, function):
+        self.function = function
+        self.nof_calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.nof_calls += 1
+        return self.function(*args, **kwargs)
+
+
+class TestCompile:
+    def test_records_operation_tree(self):
+        f, g = Pointwise(np.sin), Pointwise(np.cos)
+        expression = f + g
+        assert expression.operands == (f, g)
+        assert expression.operator(1, 2) == 3
+        assert f.operator is None
+
+    def test_fused(self):
+        f, g, h, k = Pointwise(np.sin), Pointwise(np.cos), Pointwise(np.exp), Pointwise(np.sqrt)
+        expression = 0.5 * ((f + g) * h - k) / abs(-h) ** Pointwise(2)
+        fused = expression.compile()
+        points = np.linspace(0, 1, 10 ** 5)
+        assert np.allclose(fused(points), expression(points))
+        assert fused(0.25) == expression(0.25)
+        assert fused.source.count(" = ") == 14
+
+    def test_shared_nodes_are_evaluated_once(self):
+        leaf = Counted(np.sin)
+        f = Pointwise(leaf)
+        shared = f * f + f
+        expression = shared * shared - shared
+        fused = expression.compile()
+        assert fused(0.5) == expression(0.5)
+        leaf.nof_calls = 0
+        fused(np.linspace(0, 1, 10))
+        assert leaf.nof_calls == 1
+
+    def test_opaque_nodes_are_leaves(self):
+        f = Pointwise(np.sin).after(Pointwise(lambda x: 2 * x))
+        expression = f + Pointwise(5)
+        fused = expression.compile()
+        assert fused(0.5) == np.sin(1.0) + 5
+
+
+def vector_field(p):
+    x, y = p
+    return np.asarray((-y, 1.0))
+
+
+class TestMap:
+    points = np.random.default_rng(48).random(size=(1000, 2))
+
+    def test_vectorised(self):
+        leaf = Counted(lambda p: p[0] ** 2 - np.sin(p[1]))
+        expression = Pointwise(leaf) * Pointwise(2.0)
+        values = expression.map(self.points, chunk_size=300)
+        # one call at the first point of each chunk, one vectorised call per chunk
+        assert leaf.nof_calls == 4 + 4
+        assert values.shape == (1000,)
+        assert np.allclose(values, [expression(point) for point in self.points])
+
+    def test_fallback(self):
+        leaf = Counted(vector_field)
+        values = Pointwise(leaf).map(self.points, chunk_size=300)
+        assert leaf.nof_calls == 1 + 1 + 1000
+        assert values.shape == (1000, 2)
+        assert np.allclose(values, [vector_field(point) for point in self.points])
+
+    def test_every_chunk_is_checked(self):
+        def wrong_for_the_last_chunk(p):
+            if np.shape(p) == (2, 40):
+                return np.zeros(40)
+            if np.shape(p) == (2, 50):
+                return np.stack([p[0], p[0]])
+            return p[0] ** 2
+
+        for nof_points in (240, 250):
+            leaf = Counted(wrong_for_the_last_chunk)
+            values = Pointwise(leaf).map(self.points[:nof_points], chunk_size=100)
+            assert values.shape == (nof_points,)
+            assert np.allclose(values, self.points[:nof_points, 0] ** 2)
+            # two vectorised chunks, then the last chunk point by point
+            assert leaf.nof_calls == 3 + 3 + nof_points - 200
+
+    def test_leaf_errors_are_raised(self):
+        def broken_for_arrays(p):
+            if np.ndim(p) > 1:
+                raise RuntimeError("bug")
+            return p[0]
+
+        with pytest.raises(RuntimeError):
+            Pointwise(broken_for_arrays).map(self.points)
+
+    def test_empty(self):
+        assert Pointwise(vector_field).map(np.empty((0, 2))).shape == (0,)
+
+    def test_process_pool(self):
+        values = Pointwise(vector_field).map(self.points[:20], processes=2)
+        assert np.allclose(values, [vector_field(point) for point in self.points[:20]])
+
+
+class TestMemoize:
+    def test_shared_subexpression(self):
+        leaf = Counted(np.sin)
+        shared = Pointwise(leaf).memoize()
+        expression = shared + shared * shared - abs(shared)
+        assert expression(0.5) == np.sin(0.5) + np.sin(0.5) ** 2 - abs(np.sin(0.5))
+        assert leaf.nof_calls == 1
+        expression(0.5)
+        assert leaf.nof_calls == 2
+        assert not shared.function.cache
+
+    def test_threads(self):
+        shared = Pointwise(lambda x: x * 2).memoize()
+        expression = shared + shared * shared
+        points = np.random.default_rng(49).random(size=(8, 200))
+        with ThreadPoolExecutor(4) as executor:
+            values = list(executor.map(lambda chunk: [expression(x) for x in chunk], points))
+        assert np.allclose(values, 2 * points + 4 * points ** 2)
+
+    def test_unscoped_lru(self):
+        leaf = Counted(lambda p: p[0] * p[1])
+        memoized = Pointwise(leaf).memoize(maxsize=2, scoped=False)
+        points = [np.array([1.0, 2.0]), np.array([3.0, 4.0]), np.array([5.0, 6.0])]
+        for point in points[:2] + [points[0].copy()]:
+            memoized(point)
+        assert leaf.nof_calls == 2
+        memoized(points[2])
+        memoized(points[0])
+        memoized(points[1])
+        assert leaf.nof_calls == 4
+
+    def test_signed_zero(self):
+        leaf = Counted(lambda x: np.divide(1, x))
+        memoized = Pointwise(leaf).memoize(scoped=False)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            assert memoized(0.0) == np.inf
+            assert memoized(-0.0) == -np.inf
+            memoized(complex(0.0, 0.0))
+            memoized(complex(0.0, -0.0))
+        assert leaf.nof_calls == 4
+
+    def test_unhashable_arguments(self):
+        leaf = Counted(lambda d: len(d))
+        memoized = Pointwise(leaf).memoize()
+        assert (memoized + memoized)({"a": 1}) == 2
+        assert leaf.nof_calls == 2
+
+
+class TestHashConsing:
+    def test_same_expression_same_node(self):
+        f, g = Pointwise(np.sin), Pointwise(np.cos)
+        assert (f + g) * g is (f + g) * g
+        assert 0.5 * f is 0.5 * f
+        assert -0.0 * f is not 0.0 * f
+        assert np.copysign(1, (-0.0 * f)(0.5)) == -1
+        assert f * (0.0, 1.0) is f * tuple([0.0, 1.0])
+        assert f * (-0.0, 1.0) is not f * tuple([0.0, 1.0])
+        assert f * ((1.0, -0.0),) is not f * tuple([(1.0, 0.0)])
+        assert f * ((1.0, 0.0),) is f * tuple([(1.0, 0.0)])
+        frame = np.ones(2)
+        assert f * frame is f * frame
+        assert f * frame is not f * np.ones(2)
+        assert f + g is not g + f
+        assert f.memoize() is f.memoize()
+        assert f.memoize() is not f.memoize(scoped=False)
+
+    def test_shared_evaluation(self):
+        leaf = Counted(np.sin)
+        f = Pointwise(leaf)
+        expression = abs(f) * abs(f) + abs(f)
+        fused = expression.compile()
+        leaf.nof_calls = 0
+        fused(np.linspace(0, 1, 5))
+        assert leaf.nof_calls == 1
+        assert fused.source.count(" = ") == 4
+
+    def test_released(self):
+        f = Pointwise(np.sin)
+        node = -f
+        operator = node.operator
+        assert Pointwise._interned(operator, (f,)) is node
+        del node
+        gc.collect()
+        assert Pointwise._interned(operator, (f,)) is None
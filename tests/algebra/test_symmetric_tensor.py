@@ -0,0 +1,66 @@
+import gc
+import itertools
+import weakref
+
+import pytest
+
+from mathematics.algebra.create import *
+from mathematics.algebra.symmetric_tensor import *
+
+
+def pairing(cov, con):
+    return 1 if cov == con else 0
+
+
+class TestSymmetricTensor:
+    def test_symmetric_metric_stores_upper_triangle(self):
+        basis = tuple(range(0, 4))
+        Metric = create_symmetric_tensor("Metric", symmetric())
+        g = multilinear_mapping_as_tensor(Metric, lambda slot: slot, basis, basis)(
+            lambda u, v: 10 * min(u, v) + max(u, v)
+        )
+        assert len(g) == 4 * 5 // 2
+        assert g[(2, 1)] == g[(1, 2)] == 12
+        assert g.expanded() == {(u, v): 10 * min(u, v) + max(u, v) for u in basis for v in basis}
+
+    def test_antisymmetric_form(self):
+        Form = create_symmetric_tensor("Form", antisymmetric())
+        w = Form({(1, 0): 3, (2, 2): 5, (0, 2): 1})
+        assert dict(w) == {(0, 1): -3, (0, 2): 1}
+        assert w[(1, 0)] == 3
+        assert w[(2, 2)] == 0
+        assert w + w == Form({(0, 1): -6, (0, 2): 2})
+        assert w * w == w.expanded() * w.expanded()
+        assert w.trace(0, 1, pairing) == w.expanded().trace(0, 1, pairing)
+
+    def test_riemann_symmetries(self):
+        Riemann = create_symmetric_tensor("Riemann", *riemann_symmetries())
+        R = Riemann({key: 1 for key in itertools.product(range(0, 3), repeat=4)})
+        assert len(R) == 6
+        R = Riemann({(0, 1, 0, 1): 2.0})
+        assert R[(1, 0, 0, 1)] == R[(0, 1, 1, 0)] == -2.0
+        assert R[(1, 0, 1, 0)] == 2.0
+        assert len(R.expanded()) == 4
+
+    def test_pop_and_setdefault_use_canonical_keys(self):
+        Form = create_symmetric_tensor("Form", antisymmetric())
+        w = Form({(0, 1): 3})
+        assert w.setdefault((1, 0), 7) == -3
+        assert w.setdefault((2, 1), 5) == 5
+        assert w[(1, 2)] == -5
+        assert w.pop((1, 0)) == -3
+        assert (0, 1) not in w
+        assert w.pop((1, 0), None) is None
+        assert w.pop((1, 1)) == 0
+        with pytest.raises(KeyError):
+            w.pop((0, 1))
+
+    def test_canonical_key_cache_is_per_class(self):
+        Symmetric = type("Symmetric", (SymmetricTensor,), {"slot_symmetries": (symmetric(),)})
+        assert Symmetric.canonical_key((1, 0)) == ((0, 1), 1)
+        assert (1, 0) in Symmetric.canonical_keys()
+        assert (1, 0) not in SymmetricTensor.canonical_keys()
+        reference = weakref.ref(Symmetric)
+        del Symmetric
+        gc.collect()
+        assert reference() is None
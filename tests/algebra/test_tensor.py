@@ -5,6 +5,8 @@ import pytest
 
 from mathematics.algebra.tensor import *
 from mathematics.algebra.create import *
+from mathematics.algebra.dual import Dual
+from mathematics.algebra.symmetric_tensor import symmetric
 from mathematics.tools.decorators import timeout
 
 
@@ -29,3 +31,70 @@ class TestTensor:
         A = AMap(multilinear_map)
         A2 = A * A
         pass
+
+    @timeout(seconds=5)
+    def test_outer_product(self):
+        A = Tensor({(i,): float(i) for i in range(1000)})
+        B = Tensor({(j,): 2.0 for j in range(1000)})
+        AB = A * B
+        assert len(AB) == 1000 * 1000
+        assert AB[(3, 7)] == 6.0
+
+    def test_outer_product_of_mixed_order_sums_coinciding_keys(self):
+        A = Tensor({(0,): 1, (0, 1): 2})
+        B = Tensor({(1, 2): 3, (2,): 5})
+        assert A * B == {(0, 1, 2): 1 * 3 + 2 * 5, (0, 2): 5, (0, 1, 1, 2): 6}
+
+    def test_pruning_policy(self):
+        A = Tensor({(0,): 1.0, (1,): 1e-12})
+        A.pruning_policy = PruningPolicy(absolute_tolerance=1e-9)
+        B = Tensor({(0,): -1.0, (2,): 3.0})
+        assert A + B == {(2,): 3.0}
+        AB = A * B
+        assert AB == {(0, 0): -1.0, (0, 2): 3.0}
+        assert AB.pruning_policy is A.pruning_policy
+        assert A.pruning_policy.nof_pruned == 2 + 2
+
+    def test_relative_pruning_policy_in_trace(self):
+        A = Tensor({(0, 0, 0): 1.0, (1, 1, 0): -1.0 + 1e-6, (0, 0, 1): 2.0})
+        A.pruning_policy = PruningPolicy(relative_tolerance=1e-2)
+        trace = A.trace(0, 1, lambda cov, con: 1 if cov == con else 0)
+        assert trace == {(1,): 2.0}
+        assert A.pruning_policy.nof_pruned == 1
+
+
+def bilinear_mapping(u, v):
+    return 10 * u + v
+
+
+class TestMultilinearMappingAsTensor:
+    @timeout(seconds=5)
+    def test_mixed_tensor_in_10_dimensions(self):
+        basis = Dual.standard_base_vectorspace(10)
+        dual_basis = Dual.standard_base_dual_vectorspace(basis)
+
+        def slot_to_dual(e):
+            return dual_basis[basis.index(e)] if e in basis else basis[dual_basis.index(e)]
+
+        A = mixed_tensor(Tensor, "A", basis, (2, 2), slot_to_dual)(lambda u, v, x, y: x(u) * y(v))
+        assert len(A) == 10 ** 4
+        assert sum(A.values()) == 10 ** 2
+
+    @pytest.mark.parametrize("options", [{}, {"vectorized": True}, {"processes": 2}], ids=str)
+    def test_evaluation_options(self, options):
+        basis = tuple(range(0, 3))
+        A = multilinear_mapping_as_tensor(Tensor, lambda slot: slot, basis, basis, **options)(bilinear_mapping)
+        assert A == {(u, v): 10 * u + v for u in basis for v in basis}
+
+    def test_symmetric_tensor_evaluates_canonical_keys(self):
+        basis = tuple(range(0, 3))
+        arguments = list()
+
+        def symmetric_mapping(u, v):
+            arguments.append((u, v))
+            return u * v
+
+        Metric = create_symmetric_tensor("Metric", symmetric())
+        g = multilinear_mapping_as_tensor(Metric, lambda slot: slot, basis, basis)(symmetric_mapping)
+        assert sorted(arguments) == [(u, v) for u in basis for v in basis if u <= v]
+        assert g[(2, 1)] == 2
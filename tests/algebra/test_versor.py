@@ -0,0 +1,59 @@
+import math
+
+import numpy as np
+import sympy
+
+from mathematics.algebra.create import create_clifford
+from mathematics.algebra.versor import apply_versor, rotor_exp, rotor_log, versor_matrix
+
+basis = tuple(sympy.symbols("e_{0:3}"))
+
+
+def euclidean(ei, ej):
+    return 1 if ei == ej else 0
+
+
+def minkowski(ei, ej):
+    return (1 if ei != basis[0] else -1) if ei == ej else 0
+
+
+class TestVersor:
+    def test_rotation(self):
+        Multivector = create_clifford("Versor Euclidean Algebra", euclidean)
+        e1, e2, e3 = (Multivector({(base,): 1}) for base in basis)
+        angle = 0.3
+        R = rotor_exp(-(e1 * e2) * (angle / 2))
+        expected = np.array([[math.cos(angle), -math.sin(angle), 0], [math.sin(angle), math.cos(angle), 0], [0, 0, 1]])
+        assert np.allclose(versor_matrix(R, basis).astype(float), expected)
+
+        vectors = np.random.default_rng(35).normal(size=(1000, 3))
+        rotated = apply_versor(R, vectors, basis)
+        assert rotated.shape == vectors.shape
+        assert np.allclose(rotated, vectors @ expected.T)
+        v = 2 * e1 - e3
+        w = R * v * R.reverse()
+        assert np.allclose(apply_versor(R, [2, 0, -1], basis), [w.get((slot,), 0) for slot in basis])
+
+    def test_reflection(self):
+        Multivector = create_clifford("Versor Euclidean Algebra", euclidean)
+        e1 = Multivector({(basis[0],): 1})
+        assert np.allclose(versor_matrix(2 * e1, basis).astype(float), np.diag([-1, 1, 1]))
+
+    def test_rotor_log(self):
+        Multivector = create_clifford("Versor Euclidean Algebra", euclidean)
+        e1, e2, e3 = (Multivector({(base,): 1}) for base in basis)
+        B = 0.4 * (e1 * e2) - 0.2 * (e2 * e3)
+        logarithm = rotor_log(rotor_exp(B))
+        assert all(math.isclose(logarithm.get(key, 0), value) for key, value in B.items())
+
+    def test_boost(self):
+        Spacetime = create_clifford("Versor Minkowski Algebra", minkowski)
+        e0, e1 = (Spacetime({(base,): 1}) for base in basis[:2])
+        rapidity = 0.5
+        R = rotor_exp((e0 * e1) * (rapidity / 2))
+        logarithm = rotor_log(R)
+        assert math.isclose(logarithm.get((basis[0], basis[1]), 0), rapidity / 2)
+        boost = versor_matrix(R, basis).astype(float)
+        assert np.allclose(
+            boost[:2, :2], [[math.cosh(rapidity), math.sinh(rapidity)], [math.sinh(rapidity), math.cosh(rapidity)]]
+        )
@@ -0,0 +1,45 @@
+import numpy as np
+
+from mathematics.calculus.metric_geometry import MetricGeometry
+
+
+def sphere_metric(points):
+    theta = points[..., 0]
+    metric_tensor = np.zeros(points.shape + (2,))
+    metric_tensor[..., 0, 0] = 1
+    metric_tensor[..., 1, 1] = np.sin(theta) ** 2
+    return metric_tensor
+
+
+class TestMetricGeometry:
+    def test_sphere_from_function(self):
+        theta, phi = np.meshgrid(np.linspace(0.3, 2.8, 7), np.linspace(0, 6, 5), indexing="ij")
+        geometry = MetricGeometry.from_function(sphere_metric, np.stack([theta, phi], axis=-1))
+        assert np.allclose(geometry.christoffel_symbols[..., 0, 1, 1], -np.sin(theta) * np.cos(theta), atol=1e-6)
+        assert np.allclose(geometry.christoffel_symbols[..., 1, 0, 1], np.cos(theta) / np.sin(theta), atol=1e-6)
+        assert np.allclose(geometry.ricci, sphere_metric(np.stack([theta, phi], axis=-1)), atol=1e-4)
+        assert np.allclose(geometry.scalar_curvature, 2, atol=1e-4)
+        assert geometry.christoffel_symbols is geometry.christoffel_symbols
+
+    def test_sphere_from_grid(self):
+        spacing = 0.01
+        theta, phi = np.meshgrid(np.arange(0.3, 2.8, spacing), np.arange(0, 0.1, spacing), indexing="ij")
+        geometry = MetricGeometry.from_grid(sphere_metric(np.stack([theta, phi], axis=-1)), (spacing, spacing))
+        assert geometry.scalar_curvature.shape == theta.shape
+        assert np.allclose(geometry.scalar_curvature, 2, atol=1e-3)
+
+    def test_riemann_symmetries(self):
+        rng = np.random.default_rng(44)
+        coefficients = rng.normal(size=(3, 3, 3)) * 0.1
+
+        def metric(points):
+            perturbation = np.einsum("...k,kij->...ij", np.sin(points), coefficients)
+            return np.eye(3) + perturbation + np.swapaxes(perturbation, -1, -2)
+
+        points = rng.normal(size=(4, 3))
+        geometry = MetricGeometry.from_function(metric, points)
+        lowered = np.einsum("...ia,...ajkl->...ijkl", geometry.metric_tensor, geometry.riemann)
+        assert np.allclose(lowered, -np.swapaxes(lowered, -1, -2), atol=1e-5)
+        assert np.allclose(lowered, -np.swapaxes(lowered, -3, -4), atol=1e-5)
+        assert np.allclose(lowered, np.einsum("...ijkl->...klij", lowered), atol=1e-5)
+        assert np.allclose(geometry.ricci, np.swapaxes(geometry.ricci, -1, -2), atol=1e-5)
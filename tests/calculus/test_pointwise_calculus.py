@@ -85,3 +85,14 @@ class TestPointwiseCalculus:
                 actual = Lxphi((x, y))
                 desired = desiredLxphi((x, y))
                 np.testing.assert_allclose(actual, desired, atol=1e-5, rtol=1e-5)
+
+    def test_shared_nodes(self):
+        X = PointwiseCalculus(lambda p: np.asarray((p[1], -p[0])))
+        Y = PointwiseCalculus(lambda p: np.asarray((1.0, p[0])))
+        g = PointwiseCalculus(lambda p: np.eye(2))
+        assert X.derivation() is X.derivation()
+        assert X.commutator(Y) is X.commutator(Y)
+        assert X.commutator(Y) is not Y.commutator(X)
+        E = (np.array([1.0, 0.0]), np.array([0.0, 1.0]))
+        assert X.riemann(Y, g, E) is X.riemann(Y, g, E)
+        assert X.riemann(Y, g, E) is not X.riemann(Y, g, tuple(e.copy() for e in E))
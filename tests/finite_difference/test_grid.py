@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from mathematics.finite_difference.grid import *
+
+
+class TestGrid:
+    def test_derivative(self):
+        x = np.linspace(0, 1, 11)
+        f = np.stack([x ** 2, 3 * x], axis=-1)
+        np.testing.assert_allclose(derivative(f, 0, x[1] - x[0]), np.stack([2 * x, 3 + 0 * x], axis=-1), atol=1e-12)
+        np.testing.assert_allclose(
+            derivative(x ** 3, 0, x[1] - x[0], stencil_points=(-2, -1, 0, 1, 2)), 3 * x ** 2, atol=1e-12
+        )
+        np.testing.assert_allclose(derivative(x ** 2, 0, x[1] - x[0], derivative_order=2), 2 + 0 * x, atol=1e-9)
+        with pytest.raises(ValueError):
+            derivative(x[:2], 0)
+
+    def test_gradient(self):
+        x, y = np.meshgrid(np.linspace(0, 1, 5), np.linspace(0, 2, 9), indexing="ij")
+        partials = gradient(x * y, (0.25, 0.25))
+        assert partials.shape == (5, 9, 2)
+        np.testing.assert_allclose(partials[..., 0], y, atol=1e-12)
+        np.testing.assert_allclose(partials[..., 1], x, atol=1e-12)